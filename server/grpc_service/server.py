@@ -4,18 +4,23 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import itertools
 import logging
+import math
 import os
+import re
 import signal
 import sys
 import time
-import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 import grpc
 import numpy as np
 
 from dotenv import load_dotenv
+from google.protobuf.internal import api_implementation
 
 # Generated stubs (top-level, installed via wheel)
 import inference_pb2 as pb
@@ -37,6 +42,7 @@ from shared.orchestrator import (
 
 # Per-process Mongo/Motor
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import monitoring
 
 load_dotenv()  # find server/.env when run from repo root or ./server
 
@@ -65,11 +71,26 @@ def color_code_name(name: str) -> str:
         return f"{RED}{name}{RESET}"
     return f"{MAGENTA}{name}{RESET}"
 
+# Per-RPC request id; grpc.aio runs each RPC in its own task, so the context is isolated.
+REQ_ID: ContextVar[int] = ContextVar("req_id", default=0)
+_req_counter = itertools.count(1)
+
+
+class _RequestIdFilter(logging.Filter):
+    """Expose the current request id as ``record.req_id`` for the log format."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.req_id = REQ_ID.get()
+        return True
+
+
+LOG_FORMAT = "%(levelname)s: %(name)s [%(req_id)08x] | %(message)s"
+
 try:
     import coloredlogs  # type: ignore
     coloredlogs.install(
         level=os.environ.get("LOGLEVEL", "INFO"),
-        fmt="%(levelname)s: %(name)s | %(message)s",
+        fmt=LOG_FORMAT,
         level_styles={
             "debug":    {"color": "blue"},
             "info":     {},
@@ -82,8 +103,10 @@ try:
 except Exception:
     logging.basicConfig(
         level=os.environ.get("LOGLEVEL", "INFO"),
-        format="%(levelname)s: %(name)s | %(message)s",
+        format=LOG_FORMAT,
     )
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(_RequestIdFilter())
 
 log = logging.getLogger("grpc_server")
 logging.getLogger("model_cache").setLevel(logging.INFO)  # show HIT/MISS if MODEL_CACHE_LOG=1
@@ -99,6 +122,9 @@ NP_TO_PROTO = {
 }
 # PROTO_TO_NP and sentinels come from shared.orchestrator
 
+# PredictStream data chunk size; well under the default 4 MiB per-message limit.
+STREAM_CHUNK_BYTES = int(os.environ.get("GRPC_STREAM_CHUNK_BYTES", str(1 << 20)))
+
 
 def _fmt_shape(x) -> str:
     """Convert a shape-like value to a printable list representation.
@@ -110,11 +136,41 @@ def _fmt_shape(x) -> str:
         String form of the dimensions; ``[]`` when the input cannot be iterated.
     """
     try:
-        return str(list(x))
+        return "[" + ", ".join(map(str, x)) + "]"
     except Exception:
         return "[]"
 
 
+# Cheap request checks run before any database or cache work.
+# Model names are upload filenames: reject control characters, path separators, and overlong names.
+_NAME_RE = re.compile(r"[^\x00-\x1f\x7f/\\]{1,255}")
+# Element sizes of every dtype accepted over the raw-bytes path (bool, int32/float32, int64/float64).
+_ELEM_SIZES = frozenset({1, 4, 8})
+
+
+def _precheck_tensor(dims: tuple, nbytes: int, dtype: Optional[np.dtype]) -> Optional[str]:
+    """Return a reason when dims cannot describe nbytes of tensor data, else None.
+
+    Args:
+        dims: Requested tensor dimensions.
+        nbytes: Length of tensor_content.
+        dtype: Explicit request dtype, or None when it will be derived from the model.
+
+    Returns:
+        Human-readable rejection reason, or None when the payload is plausible.
+    """
+    if any(d < 0 for d in dims):
+        return f"input.dims must be non-negative, got {list(dims)}"
+    elems = math.prod(dims)
+    if dtype is not None:
+        elem_size = 1 if dtype == np.bool_ else dtype.itemsize
+        if elems * elem_size != nbytes:
+            return f"tensor_content size {nbytes} != prod(dims) {elems} * elem_size {elem_size}"
+    elif not any(elems * size == nbytes for size in _ELEM_SIZES):
+        return f"tensor_content size {nbytes} does not match prod(dims) {elems} for any supported dtype"
+    return None
+
+
 async def _debug_log_deployed_names(models_collection):
     """Log the deployed model names visible to this process.
 
@@ -164,6 +220,79 @@ class HealthLogInterceptor(grpc.aio.ServerInterceptor):
         return handler
 
 
+# Readiness driven by MongoDB topology (SDAM) events
+class ReadinessListener(monitoring.TopologyListener):
+    """Publish gRPC health status whenever the driver's view of MongoDB changes.
+
+    PyMongo invokes listeners from its monitor threads, so updates are marshalled
+    onto the event loop. Heartbeats are performed by the driver regardless; this
+    replaces the extra ``ping`` the old polling loop issued on every interval.
+    """
+
+    def __init__(
+            self,
+            health_service: health.HealthServicer,
+            services: tuple[str, ...],
+            loop: asyncio.AbstractEventLoop,
+            logger: logging.Logger,
+    ):
+        """Bind the listener to the health servicer it should update.
+
+        Args:
+            health_service: Health servicer that exposes readiness information.
+            services: Service names whose status mirrors database reachability.
+            loop: Event loop that owns the health servicer.
+            logger: Destination for readiness transition logs.
+        """
+        self._health = health_service
+        self._services = services
+        self._loop = loop
+        self._log = logger
+        self._prev: Optional[int] = None
+        self._active = True
+
+    def detach(self) -> None:
+        """Stop publishing updates (used once shutdown has begun)."""
+        self._active = False
+
+    def _publish(self, state: int) -> None:
+        """Apply a health state on the event loop thread, logging transitions."""
+        if not self._active:
+            return
+        if state != self._prev:
+            label = "SERVING" if state == health_pb2.HealthCheckResponse.SERVING else "NOT_SERVING"
+            self._log.info("Readiness (gRPC): %s", label)
+            self._prev = state
+        try:
+            for name in self._services:
+                self._health.set(name, state)
+        except Exception:
+            pass
+
+    def _schedule(self, state: int) -> None:
+        """Hand a state update from a driver thread to the event loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._publish, state)
+        except RuntimeError:
+            pass  # loop already closed during shutdown
+
+    def opened(self, event: monitoring.TopologyOpenedEvent) -> None:
+        """Topology monitoring started; readiness is decided by the first description."""
+        pass
+
+    def description_changed(self, event: monitoring.TopologyDescriptionChangedEvent) -> None:
+        """Flip readiness when a writable server appears or disappears."""
+        writable = event.new_description.has_writable_server()
+        self._schedule(
+            health_pb2.HealthCheckResponse.SERVING if writable
+            else health_pb2.HealthCheckResponse.NOT_SERVING
+        )
+
+    def closed(self, event: monitoring.TopologyClosedEvent) -> None:
+        """Client closed; report NOT_SERVING."""
+        self._schedule(health_pb2.HealthCheckResponse.NOT_SERVING)
+
+
 # gRPC service implementation
 class InferenceService(pb_grpc.InferenceServiceServicer):
     """gRPC servicer that mirrors the REST inference contract via the orchestrator."""
@@ -188,128 +317,265 @@ class InferenceService(pb_grpc.InferenceServiceServicer):
         Returns:
             PredictReply containing output[0] mapped to the protobuf tensor type.
         """
-        request_id = uuid.uuid4().hex[:8]
-        model_name = (request.model_name or "").strip()
+        REQ_ID.set(next(_req_counter) & 0xFFFFFFFF)
+        stats = _CallStats()
+        try:
+            payload, shape, proto_dtype = await self._infer(request, context, stats)
+            stats.response_bytes = len(payload)
+            return _build_reply(payload, shape, proto_dtype)
+        finally:
+            _log_call("Predict", stats, context)
 
-        started = time.perf_counter()
-        status = grpc.StatusCode.OK
-        reason = ""     # human-readable cause for non-OK
-        req_bytes = 0
-        response_bytes = 0
-        input_shape = "[]"
-        output_shape = "[]"
-        input_dtype_str = "?"
+    async def PredictBatch(self, request_iterator, context: grpc.aio.ServicerContext):
+        """Execute Predict for every request on one bidirectional stream, replying in order.
 
-        try:
-            if not model_name:
-                status = grpc.StatusCode.INVALID_ARGUMENT
-                reason = "model_name is empty"
-                context.set_code(status)
-                context.set_details("model_name must be non-empty.")
-                return pb.PredictReply()
-
-            request_tensor = request.input
-            dims = list(request_tensor.dims)
-            input_shape = _fmt_shape(dims)
-            if not dims:
-                status = grpc.StatusCode.INVALID_ARGUMENT
-                reason = "missing dims"
-                context.set_code(status)
-                context.set_details("input.dims must be provided (non-empty).")
-                return pb.PredictReply()
-
-            tensor_bytes = request_tensor.tensor_content
-            req_bytes = len(tensor_bytes)
-
-            # Map proto enum -> NumPy (or sentinel)
-            mapped_dtype = PROTO_TO_NP.get(request_tensor.data_type, DT_UNSUPPORTED_SENTINEL)
-            if mapped_dtype is DT_UNSUPPORTED_SENTINEL:
-                status = grpc.StatusCode.INVALID_ARGUMENT
-                reason = "DT_STRING is not supported over raw tensor bytes."
-                context.set_code(status)
-                context.set_details(reason)
-                return pb.PredictReply()
-
-            if mapped_dtype is DT_UNSPECIFIED_SENTINEL:
-                request_numpy_dtype: Optional[np.dtype] = None   # derive from model
-            else:
-                request_numpy_dtype = mapped_dtype                     # explicit request dtype
-                input_dtype_str = str(request_numpy_dtype)
-
-            # Orchestrated inference (resolve/cache/validate/run)
+        Saves the per-call HEADERS and setup cost when a client sends many requests back to
+        back. The first failing request aborts the stream with that request's status.
+
+        Args:
+            request_iterator: Async iterator of PredictRequest messages.
+            context: gRPC context used to propagate status and metadata.
+
+        Yields:
+            One PredictReply per request, in request order.
+        """
+        async for request in request_iterator:
+            REQ_ID.set(next(_req_counter) & 0xFFFFFFFF)
+            stats = _CallStats()
             try:
-                inference_outputs = await self._orch.run_from_bytes(
-                    model_name=model_name,
-                    dims=dims,
-                    raw_bytes=tensor_bytes,
-                    provided_name=(request_tensor.name or ""),
-                    request_dtype=request_numpy_dtype,
-                )
-            except ModelNotFoundError as e:
-                status = grpc.StatusCode.NOT_FOUND
-                reason = str(e)
-                context.set_code(status)
-                context.set_details(str(e))
-                return pb.PredictReply()
-            except ModelNotDeployedError as e:
-                status = grpc.StatusCode.FAILED_PRECONDITION
-                reason = str(e)
-                context.set_code(status)
-                context.set_details(str(e))
-                return pb.PredictReply()
-            except InvalidInputError as e:
-                status = grpc.StatusCode.INVALID_ARGUMENT
-                reason = str(e)
-                context.set_code(status)
-                context.set_details(str(e))
-                return pb.PredictReply()
-            except Exception as e:
-                status = grpc.StatusCode.INTERNAL
-                reason = f"internal: {e}"
-                log.exception("Unexpected orchestrator error")
-                context.set_code(status)
-                context.set_details(f"Inference error: {e}")
-                return pb.PredictReply()
-
-            # Success: build ResponseTensor for output[0]
-            output_array = np.asarray(inference_outputs[0])
-            output_shape = _fmt_shape(output_array.shape)
-
-            if output_array.dtype != np.bool_:
-                output_array = output_array.astype(output_array.dtype.newbyteorder("<"), copy=False)
-            output_array = np.ascontiguousarray(output_array)
-
-            proto_dtype = (
-                    NP_TO_PROTO.get(output_array.dtype)
-                    or NP_TO_PROTO.get(output_array.dtype.newbyteorder("="))
-                    or NP_TO_PROTO.get(output_array.dtype.newbyteorder("<"))
-            )
-            if proto_dtype is None:
-                status = grpc.StatusCode.INTERNAL
-                reason = f"unsupported output dtype: {output_array.dtype}"
-                context.set_code(status)
-                context.set_details(reason)
-                return pb.PredictReply()
-
-            response_tensor = pb.ResponseTensor()
-            response_tensor.name = ""
-            response_tensor.dims.extend(list(output_array.shape))
-            response_tensor.tensor_content = output_array.tobytes(order="C")
-            response_tensor.data_type = proto_dtype
-
-            response_bytes = len(response_tensor.tensor_content)
-            return pb.PredictReply(outputs=[response_tensor])
+                payload, shape, proto_dtype = await self._infer(request, context, stats)
+                stats.response_bytes = len(payload)
+                reply = _build_reply(payload, shape, proto_dtype)
+            finally:
+                _log_call("PredictBatch", stats, context)
+            yield reply
+
+    async def PredictStream(self, request: pb.PredictRequest, context: grpc.aio.ServicerContext):
+        """Execute Predict, streaming output[0] as a header followed by raw byte chunks.
+
+        Large outputs reach the client incrementally, so it can copy each chunk into a
+        preallocated array while the rest is still in flight.
 
+        Args:
+            request: PredictRequest carrying model name and tensor payload.
+            context: gRPC context used to propagate status and metadata.
+
+        Yields:
+            One TensorChunk with the header, then TensorChunks carrying consecutive data slices.
+        """
+        REQ_ID.set(next(_req_counter) & 0xFFFFFFFF)
+        stats = _CallStats()
+        try:
+            payload, shape, proto_dtype = await self._infer(request, context, stats)
+            yield pb.TensorChunk(header=pb.TensorHeader(
+                dims=shape, data_type=proto_dtype, total_bytes=len(payload),
+            ))
+            step = STREAM_CHUNK_BYTES
+            for offset in range(0, len(payload), step):
+                yield pb.TensorChunk(data=payload[offset:offset + step])
+                stats.response_bytes = min(offset + step, len(payload))
         finally:
-            dur_ms = (time.perf_counter() - started) * 1000.0
-            code = context.code() or status or grpc.StatusCode.OK
-            code_str = color_code_name(code.name)
-            suffix = f" ({reason})" if reason else ""
-            log.info(
-                "Predict %s%s model=%s in=%s -> out=%s dtype=%s dur=%.2fms bytes=req=%d rep=%d id=%s",
-                code_str, suffix, model_name or "?", input_shape, output_shape, input_dtype_str,
-                dur_ms, req_bytes, response_bytes, request_id
+            _log_call("PredictStream", stats, context)
+
+    async def _infer(
+            self,
+            request: pb.PredictRequest,
+            context: grpc.aio.ServicerContext,
+            stats: "_CallStats",
+    ) -> tuple[bytes, tuple, int]:
+        """Validate the request, run inference, and serialize output[0].
+
+        Aborts the RPC (via context.abort) on any failure, recording status and reason in stats.
+
+        Returns:
+            (little-endian C-order bytes of output[0], its shape, its proto DataType).
+        """
+        model_name = (request.model_name or "").strip()
+        stats.model_name = model_name
+
+        if not model_name:
+            stats.status = grpc.StatusCode.INVALID_ARGUMENT
+            stats.reason = "model_name is empty"
+            await context.abort(stats.status, "model_name must be non-empty.")
+        if not _NAME_RE.fullmatch(model_name):
+            stats.status = grpc.StatusCode.INVALID_ARGUMENT
+            stats.reason = "invalid model_name"
+            await context.abort(stats.status, stats.reason)
+
+        request_tensor = request.input
+        dims = tuple(request_tensor.dims)
+        stats.input_dims = dims
+        if not dims:
+            stats.status = grpc.StatusCode.INVALID_ARGUMENT
+            stats.reason = "missing dims"
+            await context.abort(stats.status, "input.dims must be provided (non-empty).")
+
+        tensor_bytes = request_tensor.tensor_content
+        stats.req_bytes = len(tensor_bytes)
+
+        # Map proto enum -> NumPy (or sentinel)
+        mapped_dtype = PROTO_TO_NP.get(request_tensor.data_type, DT_UNSUPPORTED_SENTINEL)
+        if mapped_dtype is DT_UNSUPPORTED_SENTINEL:
+            stats.status = grpc.StatusCode.INVALID_ARGUMENT
+            stats.reason = "DT_STRING is not supported over raw tensor bytes."
+            await context.abort(stats.status, stats.reason)
+
+        if mapped_dtype is DT_UNSPECIFIED_SENTINEL:
+            request_numpy_dtype: Optional[np.dtype] = None   # derive from model
+        else:
+            request_numpy_dtype = mapped_dtype                     # explicit request dtype
+            stats.input_dtype_str = str(request_numpy_dtype)
+
+        precheck = _precheck_tensor(dims, stats.req_bytes, request_numpy_dtype)
+        if precheck:
+            stats.status = grpc.StatusCode.INVALID_ARGUMENT
+            stats.reason = precheck
+            await context.abort(stats.status, stats.reason)
+
+        # Orchestrated inference (resolve/cache/validate/run)
+        try:
+            inference_outputs = await self._orch.run_from_bytes(
+                model_name=model_name,
+                dims=dims,
+                raw_bytes=tensor_bytes,
+                provided_name=(request_tensor.name or ""),
+                request_dtype=request_numpy_dtype,
             )
+        except ModelNotFoundError as e:
+            stats.status = grpc.StatusCode.NOT_FOUND
+            stats.reason = str(e)
+            await context.abort(stats.status, stats.reason)
+        except ModelNotDeployedError as e:
+            stats.status = grpc.StatusCode.FAILED_PRECONDITION
+            stats.reason = str(e)
+            await context.abort(stats.status, stats.reason)
+        except InvalidInputError as e:
+            stats.status = grpc.StatusCode.INVALID_ARGUMENT
+            stats.reason = str(e)
+            await context.abort(stats.status, stats.reason)
+        except Exception as e:
+            stats.status = grpc.StatusCode.INTERNAL
+            stats.reason = f"internal: {e}"
+            log.exception("Unexpected orchestrator error")
+            await context.abort(stats.status, f"Inference error: {e}")
+
+        # Success: serialize output[0]. This must finish before the next await: the array may
+        # be the session's reused output buffer.
+        output_array = inference_outputs[0]
+        if not isinstance(output_array, np.ndarray):
+            output_array = np.asarray(output_array)
+        stats.output_dims = output_array.shape
+
+        if output_array.dtype != np.bool_:
+            output_array = output_array.astype(output_array.dtype.newbyteorder("<"), copy=False)
+        output_array = np.ascontiguousarray(output_array)
+
+        proto_dtype = (
+                NP_TO_PROTO.get(output_array.dtype)
+                or NP_TO_PROTO.get(output_array.dtype.newbyteorder("="))
+                or NP_TO_PROTO.get(output_array.dtype.newbyteorder("<"))
+        )
+        if proto_dtype is None:
+            stats.status = grpc.StatusCode.INTERNAL
+            stats.reason = f"unsupported output dtype: {output_array.dtype}"
+            await context.abort(stats.status, stats.reason)
+
+        return output_array.tobytes(order="C"), output_array.shape, proto_dtype
+
+
+def _build_reply(payload: bytes, shape: tuple, proto_dtype: int) -> pb.PredictReply:
+    """Wrap serialized output[0] in a PredictReply."""
+    # Populate outputs[0] in place; avoids copying a standalone tensor into the reply.
+    reply = pb.PredictReply()
+    response_tensor = reply.outputs.add()
+    response_tensor.dims.extend(shape)
+    response_tensor.data_type = proto_dtype
+    response_tensor.tensor_content = payload
+    return reply
+
+
+@dataclass(slots=True)
+class _CallStats:
+    """Per-RPC facts collected for the access log line."""
+    started: float = field(default_factory=time.perf_counter)
+    model_name: str = ""
+    status: grpc.StatusCode = grpc.StatusCode.OK
+    reason: str = ""     # human-readable cause for non-OK
+    req_bytes: int = 0
+    response_bytes: int = 0
+    input_dims: Any = ()
+    output_dims: Any = ()
+    input_dtype_str: str = "?"
+
+
+def _log_call(rpc: str, stats: _CallStats, context: grpc.aio.ServicerContext) -> None:
+    """Emit the access log line for one RPC.
+
+    Runs for context.abort() too (it raises); status/reason were set before aborting.
+    Shapes and colors are only formatted when the line will actually be emitted.
+    """
+    if log.isEnabledFor(logging.INFO):
+        dur_ms = (time.perf_counter() - stats.started) * 1000.0
+        code = context.code() or stats.status or grpc.StatusCode.OK
+        code_str = color_code_name(code.name)
+        suffix = f" ({stats.reason})" if stats.reason else ""
+        log.info(
+            "%s %s%s model=%s in=%s -> out=%s dtype=%s dur=%.2fms bytes=req=%d rep=%d",
+            rpc, code_str, suffix, stats.model_name or "?", _fmt_shape(stats.input_dims),
+            _fmt_shape(stats.output_dims), stats.input_dtype_str, dur_ms, stats.req_bytes,
+            stats.response_bytes
+        )
+
+
+# Server configuration
+def _env_flag(key: str, default: str) -> bool:
+    """Interpret an environment variable as a boolean switch."""
+    return os.environ.get(key, default).lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Typed server configuration, read from the environment once per process."""
+    mongo_uri: str
+    mongo_db: str
+    mongo_heartbeat_ms: int
+    mongo_min_pool: int
+    mongo_max_pool: int
+    max_recv: int
+    max_send: int
+    log_health: bool
+    enable_reflection: bool
+    grpc_bind: str
+    grace: float
+    max_streams: int
+    keepalive_ms: int
+    keepalive_timeout_ms: int
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables, applying the documented defaults."""
+        return cls(
+            mongo_uri=os.environ.get("NEXON_MONGO_URI", "mongodb://localhost:27017"),
+            mongo_db=os.environ.get("NEXON_MONGO_DB", "onnx_platform"),
+            mongo_heartbeat_ms=int(os.environ.get("MONGO_HEARTBEAT_MS", "5000")),
+            mongo_min_pool=int(os.environ.get("MONGO_MIN_POOL", "4")),
+            mongo_max_pool=int(os.environ.get("MONGO_MAX_POOL", "50")),
+            max_recv=int(os.environ.get("GRPC_MAX_RECV_BYTES", 32 * 1024 * 1024)),
+            max_send=int(os.environ.get("GRPC_MAX_SEND_BYTES", 32 * 1024 * 1024)),
+            log_health=_env_flag("LOG_HEALTH", "1"),
+            enable_reflection=_env_flag("ENABLE_REFLECTION", "0"),
+            grpc_bind=os.environ.get("GRPC_BIND", "[::]:50051"),
+            grace=float(os.environ.get("GRPC_GRACE_SECONDS", "5")),
+            max_streams=int(os.environ.get("GRPC_MAX_CONCURRENT_STREAMS", "1000")),
+            keepalive_ms=int(os.environ.get("GRPC_KEEPALIVE_MS", "30000")),
+            keepalive_timeout_ms=int(os.environ.get("GRPC_KEEPALIVE_TIMEOUT_MS", "10000")),
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def settings() -> Settings:
+    """Return the process-wide Settings (parsed on first use)."""
+    return Settings.from_env()
 
 
 # Server bootstrap logic
@@ -330,24 +596,46 @@ async def serve():
     Returns:
         None. The coroutine runs until interrupted and orchestrates graceful shutdown.
     """
-    mongo_uri = os.environ.get("NEXON_MONGO_URI", "mongodb://localhost:27017")
-    mongo_db  = os.environ.get("NEXON_MONGO_DB",  "onnx_platform")
+    cfg = settings()
+
+    health_servicer = health.HealthServicer()
+    fully_qualified_service = pb.DESCRIPTOR.services_by_name["InferenceService"].full_name
+    health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
+    health_servicer.set(fully_qualified_service, health_pb2.HealthCheckResponse.NOT_SERVING)
 
-    client = AsyncIOMotorClient(mongo_uri)
-    db = client[mongo_db]
+    # Readiness follows driver topology events instead of a ping loop.
+    readiness = ReadinessListener(
+        health_servicer, ("", fully_qualified_service), asyncio.get_running_loop(), log
+    )
+    client = AsyncIOMotorClient(
+        cfg.mongo_uri,
+        event_listeners=[readiness],
+        heartbeatFrequencyMS=cfg.mongo_heartbeat_ms,
+        minPoolSize=cfg.mongo_min_pool,
+        maxPoolSize=cfg.mongo_max_pool,
+    )
+    db = client[cfg.mongo_db]
     models_collection = db["models"]
     gridfs_bucket = AsyncIOMotorGridFSBucket(db)
 
-    max_recv = int(os.environ.get("GRPC_MAX_RECV_BYTES", 32 * 1024 * 1024))
-    max_send = int(os.environ.get("GRPC_MAX_SEND_BYTES", 32 * 1024 * 1024))
-
-    log_health = os.environ.get("LOG_HEALTH", "1").lower() in ("1", "true", "yes", "on")
-    interceptors = [HealthLogInterceptor(True, log)] if log_health else []
+    interceptors = [HealthLogInterceptor(True, log)] if cfg.log_health else []
 
+    # Connection-level tuning: the long-lived Envoy upstream multiplexes many
+    # streams over few connections, so raise the stream cap, keep connections
+    # warm with keepalives (no ping-strike limit on idle links), favour
+    # throughput over latency in the core, and use a 1 MiB HTTP/2 write buffer
+    # so large tensor replies are framed in fewer flushes.
     server = grpc.aio.server(
         options=[
-            ("grpc.max_receive_message_length", max_recv),
-            ("grpc.max_send_message_length",    max_send),
+            ("grpc.max_receive_message_length", cfg.max_recv),
+            ("grpc.max_send_message_length",    cfg.max_send),
+            ("grpc.so_reuseport",               1),
+            ("grpc.max_concurrent_streams",     cfg.max_streams),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.keepalive_time_ms",          cfg.keepalive_ms),
+            ("grpc.keepalive_timeout_ms",       cfg.keepalive_timeout_ms),
+            ("grpc.optimization_target",        "throughput"),
+            ("grpc.http2.write_buffer_size",    1024 * 1024),
         ],
         interceptors=interceptors,
     )
@@ -357,45 +645,10 @@ async def serve():
         server,
     )
 
-    health_servicer = health.HealthServicer()
-    fully_qualified_service = pb.DESCRIPTOR.services_by_name["InferenceService"].full_name
-    health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
-    health_servicer.set(fully_qualified_service, health_pb2.HealthCheckResponse.NOT_SERVING)
     health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
 
-    async def readiness_monitor(models_collection, health_service: health.HealthServicer):
-        """Track database reachability and publish health status updates.
-
-        Args:
-            models_collection: Motor collection for executing ping commands.
-            health_service: Health servicer that exposes readiness information.
-        """
-        prev = None
-        interval = int(os.environ.get("READINESS_INTERVAL", "5"))
-        while True:
-            try:
-                await models_collection.database.command("ping")
-                state = health_pb2.HealthCheckResponse.SERVING
-            except Exception:
-                state = health_pb2.HealthCheckResponse.NOT_SERVING
-
-            if state != prev:
-                label = "SERVING" if state == health_pb2.HealthCheckResponse.SERVING else "NOT_SERVING"
-                log.info("Readiness (gRPC): %s", label)
-                prev = state
-
-            try:
-                health_service.set("", state)
-                health_service.set(fully_qualified_service, state)
-            except Exception:
-                pass
-
-            await asyncio.sleep(interval)
-
-    readiness_task = asyncio.create_task(readiness_monitor(models_collection, health_servicer))
-
     try:
-        if os.environ.get("ENABLE_REFLECTION", "0").lower() in ("1", "true", "yes", "on"):
+        if cfg.enable_reflection:
             from grpc_reflection.v1alpha import reflection  # type: ignore
             service_names = [fully_qualified_service, health.SERVICE_NAME, reflection.SERVICE_NAME]
             reflection.enable_server_reflection(service_names, server)
@@ -403,8 +656,11 @@ async def serve():
     except Exception as e:
         log.warning("Reflection not enabled: %s", e)
 
-    addr = os.environ.get("GRPC_BIND", "[::]:50051")
-    server.add_insecure_port(addr)
+    # Comma-separated; e.g. "[::]:50051,unix:/tmp/nexon.sock" adds a Unix socket for same-host
+    # clients, which skips the TCP loopback stack.
+    addr = cfg.grpc_bind
+    for bind in filter(None, (a.strip() for a in addr.split(","))):
+        server.add_insecure_port(bind)
 
     loop = asyncio.get_running_loop()
     shutdown_event = asyncio.Event()
@@ -432,26 +688,30 @@ async def serve():
 
     await server.start()
     log.info("gRPC server listening on %s", addr)
+    if api_implementation.Type() == "python":
+        # upb (protobuf>=4.21, the default) parses/serializes in C; pure Python is far slower.
+        log.warning("protobuf is using the pure-Python backend; unset "
+                    "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION to get the upb C backend.")
 
+    # Motor connects lazily; this first query also starts topology monitoring.
     debug_task = asyncio.create_task(_debug_log_deployed_names(models_collection))
     await shutdown_event.wait()
 
     try:
+        readiness.detach()
         try:
             health_servicer.set("", health_pb2.HealthCheckResponse.NOT_SERVING)
             health_servicer.set(fully_qualified_service, health_pb2.HealthCheckResponse.NOT_SERVING)
         except Exception:
             pass
 
-        for task in (debug_task, readiness_task):
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        debug_task.cancel()
+        try:
+            await debug_task
+        except asyncio.CancelledError:
+            pass
 
-        grace = float(os.environ.get("GRPC_GRACE_SECONDS", "5"))
-        await server.stop(grace)
+        await server.stop(cfg.grace)
         await server.wait_for_termination()
     finally:
         try:
@@ -462,4 +722,9 @@ async def serve():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # optional; not available on Windows
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(serve())
@@ -1,14 +1,20 @@
 """Deployment endpoints for publishing ONNX models via the shared orchestrator."""
 from __future__ import annotations
 
+import functools
 from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping
 from urllib.parse import urlparse
 
 from bson import ObjectId
 from fastapi import APIRouter, HTTPException, Request, UploadFile, File
 from pydantic import BaseModel
+from pymongo import ReturnDocument
 
-from shared.database import fs, models_collection
+from shared.database import models_collection, next_model_version
+from .inference import invalidate_model_name
+from .upload import store_in_gridfs
 
 router = APIRouter(prefix="/deployment", tags=["Deployment"])
 
@@ -37,25 +43,21 @@ def _today_str() -> str:
     return f"{now.day}/{now.month}/{now.year}"  # portable across platforms
 
 
-def _rest_urls_from_request(base_url: str, model_name: str) -> tuple[str, str]:
-    """Build REST URLs for Envoy and the direct FastAPI development port."""
+@functools.lru_cache(maxsize=1024)
+def _endpoints_for(base_url: str, model_name: str) -> Mapping[str, str]:
+    """Return the (read-only, memoized) REST and gRPC endpoints for a model behind base_url."""
     base = base_url.rstrip("/")  # e.g., http://127.0.0.1:8080
-    rest_envoy = f"{base}/inference/infer/{model_name}"
-
     parsed = urlparse(base)
     scheme = parsed.scheme or "http"
-    rest_direct_base = f"{scheme}://127.0.0.1:8000"
-    rest_direct = f"{rest_direct_base}/inference/infer/{model_name}"
-    return rest_envoy, rest_direct
-
-
-def _grpc_addrs_from_request(base_url: str) -> tuple[str, str, str]:
-    """Derive gRPC addresses and fully qualified method name from the request URL."""
-    parsed = urlparse(base_url)
-    grpc_envoy = parsed.netloc or "127.0.0.1:8080"
-    grpc_direct = "127.0.0.1:50051"
-    grpc_fqmn = "nexon.grpc.inference.v1.InferenceService/Predict"
-    return grpc_envoy, grpc_direct, grpc_fqmn
+    return MappingProxyType({
+        # REST via Envoy and the direct FastAPI development port
+        "rest_envoy": f"{base}/inference/infer/{model_name}",
+        "rest_direct": f"{scheme}://127.0.0.1:8000/inference/infer/{model_name}",
+        # gRPC addresses and fully qualified method name
+        "grpc_envoy": parsed.netloc or "127.0.0.1:8080",
+        "grpc_direct": "127.0.0.1:50051",
+        "grpc_service": "nexon.grpc.inference.v1.InferenceService/Predict",
+    })
 
 
 @router.post(
@@ -74,14 +76,12 @@ async def deploy_file(http_request: Request, file: UploadFile = File(...)):
         if m.get("status") == "Deployed":
             raise HTTPException(status_code=400, detail="Another version of this model is already deployed!")
 
-    latest = await models_collection.find_one({"name": file.filename}, sort=[("version", -1)])
-    new_version = 1 if latest is None else int(latest["version"]) + 1
+    new_version = await next_model_version(file.filename)
 
-    file_id = await fs.upload_from_stream(file.filename, file.file)
+    file_id, size_bytes = await store_in_gridfs(file)
 
     today = _today_str()
-    rest_envoy, rest_direct = _rest_urls_from_request(str(http_request.base_url), file.filename)
-    grpc_envoy, grpc_direct, grpc_fqmn = _grpc_addrs_from_request(str(http_request.base_url))
+    endpoints = _endpoints_for(str(http_request.base_url), file.filename)
 
     meta = {
         "file_id": str(file_id),
@@ -89,21 +89,16 @@ async def deploy_file(http_request: Request, file: UploadFile = File(...)):
         "upload": today,
         "version": new_version,
         "deploy": today,
-        "size": getattr(file, "size", "unknown"),  # size may not always be available
+        "size": size_bytes,
+        "size_bytes": size_bytes,
         "status": "Deployed",
-        "endpoint": rest_envoy,  # keep legacy DB field
+        "endpoint": endpoints["rest_envoy"],  # keep legacy DB field
     }
     await models_collection.insert_one(meta)
 
     return {
         "message": f"Model {file.filename} uploaded and deployed successfully!",
-        "endpoints": {
-            "rest_envoy": rest_envoy,
-            "rest_direct": rest_direct,
-            "grpc_envoy": grpc_envoy,
-            "grpc_direct": grpc_direct,
-            "grpc_service": grpc_fqmn,
-        },
+        "endpoints": endpoints,
     }
 
 
@@ -122,25 +117,18 @@ async def deploy_model(deploy_request: DeployRequest, http_request: Request):
             raise HTTPException(status_code=400, detail="Another version of this model is already deployed!")
 
     today = _today_str()
-    rest_envoy, rest_direct = _rest_urls_from_request(str(http_request.base_url), deploy_request.model_name)
-    grpc_envoy, grpc_direct, grpc_fqmn = _grpc_addrs_from_request(str(http_request.base_url))
+    endpoints = _endpoints_for(str(http_request.base_url), deploy_request.model_name)
 
     updated = await models_collection.update_one(
         {"_id": ObjectId(deploy_request.model_id)},
-        {"$set": {"status": "Deployed", "deploy": today, "endpoint": rest_envoy}},
+        {"$set": {"status": "Deployed", "deploy": today, "endpoint": endpoints["rest_envoy"]}},
     )
     if updated.modified_count == 0:
         raise HTTPException(status_code=400, detail="Model does not exist")
 
     return {
         "message": f"Model {deploy_request.model_name} deployed successfully!",
-        "endpoints": {
-            "rest_envoy": rest_envoy,
-            "rest_direct": rest_direct,
-            "grpc_envoy": grpc_envoy,
-            "grpc_direct": grpc_direct,
-            "grpc_service": grpc_fqmn,
-        },
+        "endpoints": endpoints,
     }
 
 
@@ -150,13 +138,18 @@ async def deploy_model(deploy_request: DeployRequest, http_request: Request):
 )
 async def undeploy_model(model_name: str, undeploy_request: UndeployRequest):
     """Revert a deployed model version to the uploaded state."""
-    model = await models_collection.find_one({"name": model_name, "version": int(undeploy_request.model_version)})
-    if not model:
-        raise HTTPException(status_code=404, detail="Model not found.")
-    if model.get("status") != "Deployed":
+    version = int(undeploy_request.model_version)
+    # Single atomic transition; only fall back to a lookup to pick the right error.
+    model = await models_collection.find_one_and_update(
+        {"name": model_name, "version": version, "status": "Deployed"},
+        {"$set": {"status": "Uploaded"}},
+        projection={"_id": 1},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if model is None:
+        existing = await models_collection.find_one({"name": model_name, "version": version}, projection={"_id": 1})
+        if not existing:
+            raise HTTPException(status_code=404, detail="Model not found.")
         raise HTTPException(status_code=400, detail="Model is not deployed.")
-
-    update_result = await models_collection.update_one({"_id": model["_id"]}, {"$set": {"status": "Uploaded"}})
-    if update_result.modified_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to undeploy model.")
+    invalidate_model_name(model_name)
     return {"message": f"Model '{model_name}' (v{undeploy_request.model_version}) undeployed successfully."}
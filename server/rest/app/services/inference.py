@@ -1,16 +1,22 @@
 """REST inference endpoint backed by the shared orchestrator for parity with gRPC."""
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+import functools
+from typing import Callable, List, Optional
 import numpy as np
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, ValidationError
 
 # Project DB handles (Motor GridFS bucket + models collection)
 from shared.database import fs, models_collection
 
 # Shared inference orchestrator (unifies REST & gRPC)
 from shared.orchestrator import (
+    STR_TO_NP,
     InferenceOrchestrator,
     InvalidInputError,
     ModelNotFoundError,
@@ -20,6 +26,12 @@ from shared.orchestrator import (
 # One orchestrator per process (uses the shared in-process ModelCache)
 _orch = InferenceOrchestrator(models_collection=models_collection, gridfs_bucket=fs)
 
+
+def invalidate_model_name(model_name: str) -> None:
+    """Drop this process's cached name -> deployed file_id mapping (after undeploy/delete)."""
+    _orch.invalidate_name(model_name)
+
+
 router = APIRouter(prefix="/inference", tags=["Inference"])
 
 
@@ -39,17 +51,75 @@ class InferenceResponse(BaseModel):
     results: List[list]
 
 
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# dtypes orjson serializes natively (native byte order only).
+_ORJSON_NATIVE = frozenset(
+    np.dtype(t) for t in (
+        np.float64, np.float32, np.float16,
+        np.int64, np.int32, np.int16, np.int8,
+        np.uint64, np.uint32, np.uint16, np.uint8,
+        np.bool_,
+    )
+)
+
+
+def _encode_native(arr: np.ndarray) -> bytes:
+    """orjson fast path: read the array buffer directly."""
+    if not arr.flags.c_contiguous:
+        arr = np.ascontiguousarray(arr)
+    return orjson.dumps({"results": [arr]}, option=_ORJSON_OPTS)
+
+
+def _encode_generic(arr: np.ndarray) -> bytes:
+    """Fallback for dtypes orjson cannot read (object/string/byte-swapped tensors)."""
+    return orjson.dumps({"results": [arr.tolist()]})
+
+
+@functools.lru_cache(maxsize=None)
+def _encoder_for(dtype: np.dtype) -> Callable[[np.ndarray], bytes]:
+    """Pick the response encoder once per output dtype (fixed per deployed model)."""
+    return _encode_native if dtype in _ORJSON_NATIVE else _encode_generic
+
+
+# Generic (tolist) encodes above this size run in a worker thread.
+_OFFLOAD_BYTES = 64 * 1024
+
+
+async def _encode_results(outputs: List[np.ndarray]) -> bytes:
+    """
+    Serialize output[0] with the encoder specialized for its dtype.
+
+    Native dtypes are encoded inline, before any await, because output[0] may be a reused
+    binding buffer. Large generic-path outputs are never bound (binding only covers native
+    ONNX dtypes), so their tolist() walk is moved off the event loop.
+    """
+    out = outputs[0]
+    encode = _encoder_for(out.dtype)
+    if encode is _encode_generic and out.nbytes > _OFFLOAD_BYTES:
+        return await asyncio.to_thread(encode, out)
+    return encode(out)
+
+
 @router.post(
     "/infer/{model_name}",
-    response_model=InferenceResponse,
+    response_model=InferenceResponse,  # documentation only; the body is pre-encoded
+    response_class=Response,
     summary="Run inference on a deployed ONNX model",
     responses={
         400: {"description": "Invalid input (dtype/shape/name mismatch)"},
         404: {"description": "Model not found"},
         500: {"description": "Server error"},
     },
+    # The body is parsed by hand below; keep it in the OpenAPI schema.
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": InferenceRequest.model_json_schema()}},
+        }
+    },
 )
-async def infer(request: InferenceRequest, model_name: str):
+async def infer(model_name: str, raw: Request):
     """
     Contract (parity with gRPC, Option B'):
     - Resolve by model *name*.
@@ -58,6 +128,14 @@ async def infer(request: InferenceRequest, model_name: str):
     - Cast JSON -> NumPy using the (derived or requested) dtype.
     - Optional shape check tolerates dynamic dims.
     """
+    # Single-pass parse + validate in pydantic-core instead of json.loads then validate.
+    try:
+        request = InferenceRequest.model_validate_json(await raw.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
     try:
         # Let orchestrator enforce dtype/shape with the same rules as gRPC.
         outputs: List[np.ndarray] = await _orch.run(
@@ -65,7 +143,7 @@ async def infer(request: InferenceRequest, model_name: str):
             input_data=request.input,
             request_dtype_str=request.dtype,  # Option B': optional dtype string
         )
-        return {"results": [o.tolist() for o in outputs]}
+        return Response(content=await _encode_results(outputs), media_type="application/json")
     except ModelNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ModelNotDeployedError as e:
@@ -75,3 +153,69 @@ async def infer(request: InferenceRequest, model_name: str):
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {e}")
+
+
+def _parse_shape_header(value: Optional[str]) -> List[int]:
+    """Parse an ``X-Shape`` header (``"1,3,224,224"``; empty means scalar)."""
+    if value is None:
+        raise HTTPException(status_code=400, detail="Missing X-Shape header.")
+    try:
+        return [int(d) for d in value.split(",")] if value.strip() else []
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Malformed X-Shape header: {value!r}")
+
+
+@router.post(
+    "/infer_bin/{model_name}",
+    response_class=Response,
+    summary="Run inference on raw tensor bytes (application/octet-stream)",
+    responses={
+        200: {
+            "content": {"application/octet-stream": {}},
+            "description": "Raw row-major bytes of output[0]; shape/dtype in X-Shape/X-Dtype.",
+        },
+        400: {"description": "Invalid input (dtype/shape/size mismatch or bad headers)"},
+        404: {"description": "Model not found"},
+        500: {"description": "Server error"},
+    },
+)
+async def infer_bin(model_name: str, raw: Request):
+    """
+    Binary sibling of ``infer`` that skips JSON entirely.
+
+    The body is the row-major tensor for input[0]; ``X-Shape`` carries the
+    comma-separated dims and the optional ``X-Dtype`` (``float32``, ``int64``, ...)
+    must match the model input when present, exactly like ``data_type`` over gRPC.
+    The reply body is output[0] as raw bytes with the same two headers.
+    """
+    dims = _parse_shape_header(raw.headers.get("x-shape"))
+    dtype_str = raw.headers.get("x-dtype")
+    request_dtype = None
+    if dtype_str:
+        request_dtype = STR_TO_NP.get(dtype_str)
+        if request_dtype is None:
+            raise HTTPException(status_code=400, detail=f"Unsupported request dtype: {dtype_str}")
+
+    body = await raw.body()
+    try:
+        outputs: List[np.ndarray] = await _orch.run_from_bytes(
+            model_name=model_name,
+            dims=dims,
+            raw_bytes=body,
+            request_dtype=request_dtype,
+        )
+        out = outputs[0]
+        # Copy out before any further await: out may be a reused binding buffer.
+        return Response(
+            content=out.tobytes(order="C"),
+            media_type="application/octet-stream",
+            headers={"X-Shape": ",".join(map(str, out.shape)), "X-Dtype": out.dtype.name},
+        )
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ModelNotDeployedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InvalidInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Server error: {e}")
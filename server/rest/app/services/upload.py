@@ -2,27 +2,61 @@
 
 from __future__ import annotations
 
-import math
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
 from fastapi import APIRouter, File, UploadFile, HTTPException
 from pydantic import BaseModel
 
-from shared.database import fs, models_collection
+from shared.database import fs, models_collection, next_model_version
+
+# GridFS chunk size for uploaded models (also the read size off the spooled upload).
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
 router = APIRouter(prefix="/upload", tags=["Upload"])
 
 
 def convert_size(size_bytes: int) -> str:
     """Convert byte counts into human-readable units."""
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0B"
     size_name = ("Bytes", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
+    # floor(log1024(n)) in integer arithmetic: no libm calls, no rounding at 1023/1024
+    i = min((size_bytes.bit_length() - 1) // 10, len(size_name) - 1)
+    s = round(size_bytes / (1 << (10 * i)), 2)
     return f"{s} {size_name[i]}"
 
 
+# (next local midnight as epoch seconds, "DD/MM/YYYY" for the current day)
+_date_cache: tuple[float, str] = (0.0, "")
+
+
+def _today_str() -> str:
+    """Return today's zero-padded DD/MM/YYYY, formatting only once per local day."""
+    global _date_cache
+    if time.time() >= _date_cache[0]:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        _date_cache = (midnight.timestamp(), now.strftime("%d/%m/%Y"))
+    return _date_cache[1]
+
+
+async def store_in_gridfs(file: UploadFile) -> tuple[ObjectId, int]:
+    """Stream an upload into GridFS in 1 MiB chunks; return (file_id, size in bytes)."""
+    grid_in = fs.open_upload_stream(file.filename, chunk_size_bytes=UPLOAD_CHUNK_BYTES)
+    size = 0
+    try:
+        # UploadFile.read() runs the spooled-file read in a worker thread.
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            await grid_in.write(chunk)
+    except BaseException:
+        await grid_in.abort()
+        raise
+    await grid_in.close()
+    return grid_in._id, size
+
+
 class UploadResponse(BaseModel):
     """Response payload returned after successfully uploading a model."""
     message: str
@@ -41,22 +75,13 @@ async def upload_file(file: UploadFile = File(...)):
     if not file.filename.endswith(".onnx"):
         raise HTTPException(status_code=400, detail="Only ONNX files are allowed.")
     try:
-        latest = await models_collection.find_one(
-            {"name": file.filename}, sort=[("version", -1)]
-        )
-        new_version = 1 if latest is None else int(latest["version"]) + 1
-
-        file_id = await fs.upload_from_stream(file.filename, file.file)
+        new_version = await next_model_version(file.filename)
 
-        # Preserve semantics; some servers don't expose UploadFile.size → fallback to "unknown"
-        size_bytes = getattr(file, "size", None)
-        try:
-            size = convert_size(int(size_bytes)) if size_bytes is not None else "unknown"
-        except Exception:
-            size = "unknown"
+        file_id, size_bytes = await store_in_gridfs(file)
+        size = convert_size(size_bytes)
 
         # Use portable zero-padded day/month (Windows-compatible)
-        upload_date = datetime.now().strftime("%d/%m/%Y")
+        upload_date = _today_str()
 
         meta = {
             "file_id": str(file_id),
@@ -65,6 +90,7 @@ async def upload_file(file: UploadFile = File(...)):
             "version": new_version,
             "deploy": "",
             "size": size,
+            "size_bytes": size_bytes,  # raw count for sorting/filtering without re-parsing
             "status": "Uploaded",
         }
         result = await models_collection.insert_one(meta)
@@ -2,33 +2,45 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import time
 
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from bson import ObjectId
-from bson.errors import InvalidId
 
 # Routers (now APIRouter-based)
 from rest.app.services import inference, deployment, upload
 
 # Shared DB handles
-from shared.database import fs, models_collection
+from shared.database import ensure_indexes, fs, models_collection, ping
 from shared.database import client as mongo_client
 
 LOG_HEALTH = os.getenv("LOG_HEALTH", "0").lower() in ("1", "true", "yes", "on")
 
+_SUPPRESSED_PATHS = frozenset(("/healthz", "/readyz"))
+
 class _HealthAccessFilter(logging.Filter):
     """Suppress health endpoints from access logs unless explicitly enabled."""
 
     def filter(self, record: logging.LogRecord) -> bool:
         if LOG_HEALTH:
             return True
-        msg = record.getMessage()
+        args = record.args
+        # uvicorn.access args: (client, method, path_with_query, http_version, status)
+        if isinstance(args, tuple) and len(args) >= 3 and isinstance(args[2], str):
+            return args[2].partition("?")[0] not in _SUPPRESSED_PATHS
+        msg = record.getMessage()  # unexpected record shape: fall back to the text
         return ("/healthz" not in msg) and ("/readyz" not in msg)
 
-logging.getLogger("uvicorn.access").addFilter(_HealthAccessFilter())
+# Idempotent: re-imports (e.g. --reload, importlib.reload) must not stack filters.
+_access_logger = logging.getLogger("uvicorn.access")
+if not any(type(f).__name__ == "_HealthAccessFilter" for f in _access_logger.filters):
+    _access_logger.addFilter(_HealthAccessFilter())
 
 openapi_tags = [
     {"name": "Upload", "description": "Upload ONNX models (status -> Uploaded)."},
@@ -42,6 +54,7 @@ app = FastAPI(
     version="1.1",
     description="Upload, deploy, and run inference on ONNX models (MongoDB + GridFS).",
     openapi_tags=openapi_tags,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -65,10 +78,20 @@ async def readyz():
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"not ready: {e}")
 
+_background_tasks: set[asyncio.Task] = set()
+
 @app.on_event("startup")
 async def _on_startup():
-    """Emit startup log entry."""
-    logging.getLogger("rest").info("REST starting...")
+    """Warm the Mongo connection, then ensure indexes without delaying startup."""
+    logger = logging.getLogger("rest")
+    logger.info("REST starting...")
+    # Pay the connect/auth handshake here rather than on the first user request.
+    t0 = time.perf_counter()
+    if await ping():
+        logger.info("Mongo warm-up ping ok (%.1f ms)", (time.perf_counter() - t0) * 1000)
+    task = asyncio.create_task(ensure_indexes())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 @app.on_event("shutdown")
 async def _on_shutdown():
@@ -95,53 +118,91 @@ async def root():
     return {"message": "Welcome to the ONNX Inference API!"}
 
 # Inventory endpoints
+# Only the fields the dashboard renders; served by the {status, _id} index.
+_INVENTORY_PROJECTION = {
+    "_id": 1, "file_id": 1, "name": 1, "version": 1, "upload": 1,
+    "size": 1, "size_bytes": 1, "status": 1, "deploy": 1, "endpoint": 1,
+}
+
+def _bson_default(o):
+    """orjson fallback: render ObjectIds as hex strings; anything else is an error."""
+    if isinstance(o, ObjectId):
+        return str(o)
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+_STREAM_FLUSH_BYTES = 64 * 1024
+
+async def _iter_models_json(query: dict):
+    """Yield a JSON array of matching documents, flushing roughly every 64 KiB."""
+    cursor = models_collection.find(query, projection=_INVENTORY_PROJECTION).batch_size(500)
+    buf = bytearray(b"[")
+    first = True
+    async for m in cursor:
+        if not first:
+            buf += b","
+        first = False
+        buf += orjson.dumps(m, default=_bson_default)
+        if len(buf) >= _STREAM_FLUSH_BYTES:
+            yield bytes(buf)
+            buf.clear()
+    buf += b"]"
+    yield bytes(buf)
+
+def _list_models(query: dict) -> StreamingResponse:
+    """Stream matching model documents as a JSON array, with ObjectIds rendered as strings."""
+    return StreamingResponse(_iter_models_json(query), media_type="application/json")
+
 @app.get("/deployedModels", tags=["Inventory"])
 async def get_deployed_models():
     """List deployed models with serialized identifiers."""
-    models = [m async for m in models_collection.find({"status": "Deployed"})]
-    for m in models:
-        m["_id"] = str(m["_id"])
-        m["file_id"] = str(m["file_id"])
-    return models
+    return _list_models({"status": "Deployed"})
 
 @app.get("/uploadedModels", tags=["Inventory"])
 async def get_uploaded_models():
     """List uploaded (not deployed) models with serialized identifiers."""
-    models = [m async for m in models_collection.find({"status": "Uploaded"})]
-    for m in models:
-        m["_id"] = str(m["_id"])
-        m["file_id"] = str(m["file_id"])
-    return models
+    return _list_models({"status": "Uploaded"})
 
 @app.get("/allModels", tags=["Inventory"])
 async def get_all_models():
     """List all models regardless of status with serialized identifiers."""
-    models = [m async for m in models_collection.find({})]
-    for m in models:
-        m["_id"] = str(m["_id"])
-        m["file_id"] = str(m["file_id"])
-    return models
+    return _list_models({})
+
+def _parse_file_id(file_id) -> ObjectId | None:
+    """Return file_id as an ObjectId (one C-level hex decode, no exception on the happy path)."""
+    if isinstance(file_id, ObjectId):
+        return file_id
+    if not isinstance(file_id, str) or len(file_id) != 24:
+        return None
+    try:
+        raw = bytes.fromhex(file_id)
+    except ValueError:
+        return None
+    return ObjectId(raw) if len(raw) == 12 else None
 
 @app.delete("/deleteModel/{model_name}/{model_version}", tags=["Inventory"])
 async def delete_model(model_name: str, model_version: int):
     """Remove a model and its GridFS payload."""
-    model = await models_collection.find_one({"name": model_name, "version": int(model_version)})
+    model = await models_collection.find_one(
+        {"name": model_name, "version": int(model_version)}, projection={"_id": 1, "file_id": 1}
+    )
     if not model:
         raise HTTPException(status_code=404, detail="Model not found.")
     file_id = model.get("file_id")
     if not file_id:
         raise HTTPException(status_code=400, detail="Model does not have a valid file ID.")
-    try:
-        oid = ObjectId(file_id)
-    except InvalidId:
+    oid = _parse_file_id(file_id)
+    if oid is None:
         raise HTTPException(status_code=400, detail="Invalid file_id; expected a valid ObjectId.")
-    try:
-        await fs.delete(oid)
-        delete_result = await models_collection.delete_one({"_id": model["_id"]})
-        if delete_result.deleted_count != 1:
-            raise HTTPException(status_code=500, detail="Failed to delete model metadata.")
-        return {"message": f"Model '{model_name}' (v{model_version}) deleted successfully."}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error deleting model: {e}")
+    # Payload and metadata live in different collections: delete both in one round-trip.
+    fs_result, delete_result = await asyncio.gather(
+        fs.delete(oid),
+        models_collection.delete_one({"_id": model["_id"]}),
+        return_exceptions=True,
+    )
+    for result in (fs_result, delete_result):
+        if isinstance(result, BaseException):
+            raise HTTPException(status_code=500, detail=f"Error deleting model: {result}")
+    if delete_result.deleted_count != 1:
+        raise HTTPException(status_code=500, detail="Failed to delete model metadata.")
+    inference.invalidate_model_name(model_name)
+    return {"message": f"Model '{model_name}' (v{model_version}) deleted successfully."}
@@ -7,6 +7,8 @@ import logging
 from typing import Optional
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 # Load .env for local development (no effect in Docker unless env vars are missing).
 try:
@@ -39,6 +41,8 @@ MONGO_DB: str = _first_env(
 # Tunables with sane defaults
 SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
 UUID_REPRESENTATION = os.getenv("MONGO_UUID_REPRESENTATION", "standard")  # Motor/PyMongo option
+MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL", "4"))    # sockets kept warm by the driver
+MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL", "50"))
 
 # Redact credentials in logs.
 def _redact(uri: str) -> str:
@@ -59,12 +63,15 @@ client: AsyncIOMotorClient = AsyncIOMotorClient(
     MONGO_URI,
     serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
     uuidRepresentation=UUID_REPRESENTATION,
+    minPoolSize=MIN_POOL_SIZE,
+    maxPoolSize=MAX_POOL_SIZE,
 )
 db = client[MONGO_DB]
 database = db  # backward-compat alias
 
 # Collections / buckets
 models_collection = db["models"]
+model_versions = db["model_versions"]  # {_id: model name, v: last issued version}
 fs: AsyncIOMotorGridFSBucket = AsyncIOMotorGridFSBucket(db)
 
 log.info("MongoDB connected (uri=%s, db=%s)", _redact(MONGO_URI), MONGO_DB)
@@ -79,6 +86,50 @@ async def ping() -> bool:
         log.warning("Mongo ping failed: %s", e)
         return False
 
+# Indexes backing the hot queries: status-filtered inventory listings, name
+# lookups sorted by newest version (upload/deploy, orchestrator resolution),
+# and size-ordered listings.
+MODEL_INDEXES = (
+    [("status", 1), ("_id", 1)],
+    [("name", 1), ("version", -1)],
+    [("size_bytes", -1)],
+)
+
+async def ensure_indexes() -> None:
+    """Create the models collection indexes (idempotent; failures are logged, not raised)."""
+    for keys in MODEL_INDEXES:
+        try:
+            await models_collection.create_index(keys)
+        except Exception as e:
+            log.warning("Index creation failed for %s: %s", keys, e)
+
+async def next_model_version(name: str) -> int:
+    """
+    Atomically issue the next version number for a model name.
+
+    Steady state is a single find_one_and_update on the counter's _id. The first call
+    for a name seeds the counter from the newest existing document ($max, so a racing
+    seeder cannot move it backwards) before incrementing.
+    """
+    doc = await model_versions.find_one_and_update(
+        {"_id": name}, {"$inc": {"v": 1}}, return_document=ReturnDocument.AFTER
+    )
+    if doc is not None:
+        return int(doc["v"])
+
+    latest = await models_collection.find_one(
+        {"name": name}, projection={"version": 1}, sort=[("version", -1)]
+    )
+    seed = int(latest["version"]) if latest else 0
+    try:
+        await model_versions.update_one({"_id": name}, {"$max": {"v": seed}}, upsert=True)
+    except DuplicateKeyError:
+        pass  # a concurrent upload created the counter first; $inc below still applies
+    doc = await model_versions.find_one_and_update(
+        {"_id": name}, {"$inc": {"v": 1}}, return_document=ReturnDocument.AFTER
+    )
+    return int(doc["v"])
+
 __all__ = [
     "MONGO_URI",
     "MONGO_DB",
@@ -86,6 +137,9 @@ __all__ = [
     "db",
     "database",
     "models_collection",
+    "model_versions",
     "fs",
     "ping",
+    "ensure_indexes",
+    "next_model_version",
 ]
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import logging
 import os
+import tempfile
 import time
-from typing import Any, Dict, Tuple
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
 
 from bson import ObjectId
 import onnxruntime as ort  # use qualified names to avoid stub/IDE issues
@@ -28,16 +31,26 @@ class ModelCache:
 
     Key points:
       - Key: GridFS file_id (ObjectId); str/bytes identifiers are normalized.
-      - Storage: dict-based LRU with timestamps for eviction and TTL checks.
-      - Concurrency: per-key asyncio.Lock prevents duplicate loads.
+      - Storage: OrderedDict LRU (least recent first) with a load timestamp for TTL checks.
+        With MODEL_CACHE_POLICY=slru, a second 'protected' OrderedDict holds entries hit at
+        least twice; one-off loads (scans) only ever displace the probationary segment.
+      - Concurrency: one in-flight load Future per file_id; concurrent misses await it.
       - Session creation: instantiated from GridFS bytes using onnxruntime.InferenceSession.
+      - Metadata: optional meta_factory(session) result cached alongside each session.
       - Tunables (env):
           MODEL_CACHE_MAX (default 64)
           MODEL_CACHE_TTL (default 0; disabled)
-          ORT_INTRA_OP_THREADS (default 0)
-          ORT_INTER_OP_THREADS (default 0)
+          MODEL_CACHE_POLICY (lru | slru; default lru)
+          MODEL_CACHE_PROTECTED_RATIO (slru only; default 0.8 of MODEL_CACHE_MAX)
+          ORT_INTRA_OP_THREADS / NEXON_ORT_THREADS (default 0 = one per physical core)
+          ORT_INTER_OP_THREADS (default 1; sequential execution)
+          ORT_SHARED_THREADPOOL (default 0; 1 = sessions own no pool threads, see __init__)
           ORT_GRAPH_OPT_LEVEL (default 99)
+          ORT_ALLOW_SPINNING (default 0)
+          ORT_CPU_MEM_ARENA (default 0; see shared.orchestrator.RUN_OPTIONS for shrinkage)
           MODEL_CACHE_LOG (default 0)
+          MODEL_CACHE_LOAD_VIA_FILE (default 1; 0 = build sessions from in-memory bytes)
+          MODEL_CACHE_TMPDIR (default: system temp dir; e.g. /dev/shm for tmpfs)
     """
 
     def __init__(
@@ -47,9 +60,10 @@ class ModelCache:
             max_entries: int | None = None,
             ttl_seconds: int | None = None,
             providers: list[str] | None = None,
+            meta_factory: Callable[[OrtInferenceSession], Any] | None = None,
     ):
-        if not hasattr(gridfs_db, "open_download_stream"):
-            raise TypeError("gridfs_db must expose 'open_download_stream(file_id)' (Motor GridFS bucket).")
+        if not hasattr(gridfs_db, "download_to_stream"):
+            raise TypeError("gridfs_db must expose 'download_to_stream(file_id, dest)' (Motor GridFS bucket).")
         # Soft check only; allow fakes/mocks in tests
         if AsyncIOMotorGridFSBucket is not None and not isinstance(gridfs_db, AsyncIOMotorGridFSBucket):
             pass
@@ -58,21 +72,66 @@ class ModelCache:
         self._max = max_entries or int(os.environ.get("MODEL_CACHE_MAX", "64"))
         self._ttl = ttl_seconds or int(os.environ.get("MODEL_CACHE_TTL", "0"))
         self._providers = providers  # None -> ORT default
-        self._cache: Dict[ObjectId, Tuple[OrtInferenceSession, float, float]] = {}
-        self._locks: Dict[ObjectId, asyncio.Lock] = {}
-        self._global_lock = asyncio.Lock()
+        self._meta_factory = meta_factory
+        # LRU: everything lives in _cache. SLRU: _cache is the probationary segment and
+        # _protected holds re-referenced entries (capped at _protected_max).
+        self._cache: "OrderedDict[ObjectId, Tuple[OrtInferenceSession, Any, float]]" = OrderedDict()
+        self._protected: "OrderedDict[ObjectId, Tuple[OrtInferenceSession, Any, float]]" = OrderedDict()
+        policy = os.environ.get("MODEL_CACHE_POLICY", "lru").lower()
+        if policy not in ("lru", "slru"):
+            raise ValueError(f"MODEL_CACHE_POLICY must be 'lru' or 'slru', got '{policy}'")
+        self._slru = policy == "slru"
+        self._protected_max = 0
+        if self._slru and self._max > 0:
+            raw_ratio = os.environ.get("MODEL_CACHE_PROTECTED_RATIO", "0.8")
+            try:
+                ratio = float(raw_ratio)
+            except ValueError:
+                ratio = float("nan")
+            if not 0.0 <= ratio < 1.0:
+                raise ValueError(f"MODEL_CACHE_PROTECTED_RATIO must be in [0, 1), got '{raw_ratio}'")
+            # Leave at least one probationary slot: with none, every fresh load would be the
+            # eviction victim and be reloaded from GridFS on each request.
+            self._protected_max = min(max(1, int(self._max * ratio)), self._max - 1)
+        # In-flight loads only: entries exist for the duration of a cold load, so memory is
+        # bounded by concurrent misses rather than by the number of models ever seen.
+        self._loading: "dict[ObjectId, asyncio.Future]" = {}
 
         # Logging (off by default)
         self._log = logging.getLogger("model_cache")
         self._verbose = os.environ.get("MODEL_CACHE_LOG", "0") == "1"
 
+        # InferenceSession(bytes) keeps the Python bytes alive for the session's lifetime
+        # (~2x model size resident); a session built from a path holds only the parsed graph.
+        self._via_file = os.environ.get("MODEL_CACHE_LOAD_VIA_FILE", "1") == "1"
+        self._tmpdir = os.environ.get("MODEL_CACHE_TMPDIR") or None
+
         # Session options (robust to missing stubs in IDEs)
         SessionOptionsCls = getattr(ort, "SessionOptions", None)
         if SessionOptionsCls is None:
             raise RuntimeError("onnxruntime.SessionOptions not found -- check your onnxruntime installation.")
         so = SessionOptionsCls()
-        so.intra_op_num_threads = int(os.environ.get("ORT_INTRA_OP_THREADS", "0"))
-        so.inter_op_num_threads = int(os.environ.get("ORT_INTER_OP_THREADS", "0"))
+        # Concurrency comes from the event loop / batcher, not from ORT: one sequential
+        # intra-op pool per session, and no busy-wait spinning between runs so concurrent
+        # sessions do not burn each other's cores.
+        so.intra_op_num_threads = int(
+            os.environ.get("ORT_INTRA_OP_THREADS") or os.environ.get("NEXON_ORT_THREADS", "0")
+        )
+        # Every session otherwise spawns its own intra-op pool (intra_op_num_threads - 1 threads),
+        # so MODEL_CACHE_MAX cached models mean MODEL_CACHE_MAX pools. The Python binding has
+        # no global/shared thread pool API (that is C API only), so the shared mode runs each
+        # session on the calling thread and leaves parallelism to the process-level concurrency.
+        if os.environ.get("ORT_SHARED_THREADPOOL", "0") == "1":
+            so.intra_op_num_threads = 1
+        so.inter_op_num_threads = int(os.environ.get("ORT_INTER_OP_THREADS", "1"))
+        so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        spinning = os.environ.get("ORT_ALLOW_SPINNING", "0")
+        so.add_session_config_entry("session.intra_op.allow_spinning", spinning)
+        so.add_session_config_entry("session.inter_op.allow_spinning", spinning)
+        # The CPU arena grows to the high-water mark of every shape ever seen and never
+        # returns memory; with many cached models that dominates RSS. Off by default at the
+        # cost of plain malloc/free per run; when enabled, runs shrink it afterwards.
+        so.enable_cpu_mem_arena = os.environ.get("ORT_CPU_MEM_ARENA", "0") == "1"
         try:
             opt_level = int(os.environ.get("ORT_GRAPH_OPT_LEVEL", "99"))
             # Some stubs do not advertise this attribute; it exists at runtime.
@@ -91,113 +150,156 @@ class ModelCache:
         except Exception as e:
             raise ValueError(f"Invalid GridFS file_id '{file_id}': {e}") from e
 
-    def _lock_for(self, oid: ObjectId) -> asyncio.Lock:
-        """Return the per-model lock, creating it on demand."""
-        lk = self._locks.get(oid)
-        if lk is None:
-            lk = self._locks[oid] = asyncio.Lock()
-        return lk
-
     async def get_session(self, file_id: Any) -> OrtInferenceSession:
         """
         Return a cached ORT session for file_id, loading it from GridFS on a cache miss.
-        Concurrent calls for the same file_id are serialized.
+        Concurrent misses for the same file_id share a single load.
         """
+        session, _ = await self.get_session_and_meta(file_id)
+        return session
+
+    async def get_session_and_meta(self, file_id: Any) -> Tuple[OrtInferenceSession, Any]:
+        """Like get_session, but also return the cached meta_factory(session) result (or None)."""
         oid = self._normalize_id(file_id)
         now = time.time()
 
-        sess = await self._get_if_fresh(oid, now)
-        if sess is not None:
+        entry = self._get_if_fresh(oid, now)
+        if entry is not None:
             if self._verbose:
                 self._log.info("CACHE HIT file_id=%s", oid)
-            return sess
+            return entry
 
-        lk = self._lock_for(oid)
-        async with lk:
-            # Re-check after acquiring the per-key lock
-            sess = await self._get_if_fresh(oid, now)
-            if sess is not None:
-                if self._verbose:
-                    self._log.info("CACHE HIT (post-lock) file_id=%s", oid)
-                return sess
+        # The check above and the registration below run without an await in between, so
+        # exactly one coroutine becomes the loader; everyone else awaits its Future.
+        while (fut := self._loading.get(oid)) is not None:
+            try:
+                # shield: a cancelled waiter must not cancel the shared load.
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise  # this waiter was cancelled
+            # The loader was cancelled; re-check and, if still missing, take over.
+            entry = self._get_if_fresh(oid, time.time())
+            if entry is not None:
+                return entry
 
-            # Miss -> load
-            if self._verbose:
-                self._log.info("CACHE MISS file_id=%s -- loading from GridFS...", oid)
-            grid_out = None
+        fut = asyncio.get_running_loop().create_future()
+        self._loading[oid] = fut
+        try:
+            entry = await self._load(oid, now)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved: waiters re-raise it, no "never retrieved" log
+            raise
+        else:
+            fut.set_result(entry)
+            return entry
+        finally:
+            self._loading.pop(oid, None)
+
+    async def _load(self, oid: ObjectId, now: float) -> Tuple[OrtInferenceSession, Any]:
+        """Read model bytes from GridFS, build the session, and publish it (caller owns the load Future)."""
+        # Miss -> load
+        if self._verbose:
+            self._log.info("CACHE MISS file_id=%s -- loading from GridFS...", oid)
+        # download_to_stream runs PyMongo's whole chunk loop on Motor's executor thread: one
+        # await per model instead of one event-loop round-trip per 255 KiB chunk. Chunks are
+        # written to dest as they arrive, so peak memory stays ~1x the model size.
+        tmp_path = None
+        try:
             try:
-                grid_out = await self._fs.open_download_stream(file_id=oid)
-                model_bytes = await grid_out.read()
+                if self._via_file:
+                    # Stream chunks straight to disk; the model never sits in Python memory.
+                    with tempfile.NamedTemporaryFile(
+                            prefix="nexon-model-", suffix=".onnx", dir=self._tmpdir, delete=False
+                    ) as f:
+                        tmp_path = f.name
+                        await self._fs.download_to_stream(oid, f)
+                        nbytes = f.tell()
+                    model_src: Any = tmp_path
+                else:
+                    buf = io.BytesIO()
+                    await self._fs.download_to_stream(oid, buf)
+                    model_src = buf.getvalue()  # hands over the internal buffer, no copy
+                    del buf
+                    nbytes = len(model_src)
                 if self._verbose:
-                    self._log.debug("READ %d bytes for file_id=%s", len(model_bytes), oid)
+                    self._log.debug("READ %d bytes for file_id=%s", nbytes, oid)
             except Exception as e:
                 raise RuntimeError(f"Failed to read model bytes from GridFS for {oid}: {e}") from e
-            finally:
-                # Best-effort close; supports both async and sync close() implementations.
-                try:
-                    if grid_out is not None:
-                        closer = getattr(grid_out, "close", None)
-                        if callable(closer):
-                            result = closer()
-                            if asyncio.iscoroutine(result):
-                                await result
-                except Exception:
-                    # Never let a close error mask the actual operation outcome.
-                    if self._verbose:
-                        self._log.debug("Ignoring GridFS close() error for file_id=%s", oid)
 
             try:
                 session = ort.InferenceSession(
-                    model_bytes,
+                    model_src,
                     sess_options=self._sess_options,
                     providers=self._providers,
                 )
             except Exception as e:
                 raise RuntimeError(f"Failed to create InferenceSession for {oid}: {e}") from e
+        finally:
+            # ORT has fully read the file once the constructor returns.
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    self._log.warning("Could not remove temporary model file %s", tmp_path)
+        meta = self._meta_factory(session) if self._meta_factory is not None else None
 
-            async with self._global_lock:
-                self._cache[oid] = (session, now, now)
-                self._evict_if_needed(now=now)
-            if self._verbose:
-                self._log.info("CACHE LOAD COMPLETE file_id=%s", oid)
+        # Publish + evict without a lock: no await in between, so no other coroutine can
+        # observe the cache over capacity or interleave with the eviction.
+        self._cache[oid] = (session, meta, now)
+        self._cache.move_to_end(oid)
+        self._evict_if_needed()
+        if self._verbose:
+            self._log.info("CACHE LOAD COMPLETE file_id=%s", oid)
 
-            return session
+        return session, meta
 
-    async def _get_if_fresh(self, oid: ObjectId, now: float) -> OrtInferenceSession | None:
-        """Return cached session if unexpired; otherwise purge and return None."""
-        tpl = self._cache.get(oid)
-        if not tpl:
-            return None
-        session, loaded_at, last_used = tpl
+    def _get_if_fresh(self, oid: ObjectId, now: float) -> Tuple[OrtInferenceSession, Any] | None:
+        """
+        Return the cached (session, meta) if unexpired; otherwise purge and return None.
+
+        Synchronous on purpose: every step is a single OrderedDict operation with no
+        await in between, so it is atomic with respect to other coroutines and needs no lock.
+        """
+        segment = self._protected
+        tpl = segment.get(oid)
+        if tpl is None:
+            segment = self._cache
+            tpl = segment.get(oid)
+            if tpl is None:
+                return None
+        session, meta, loaded_at = tpl
 
         # TTL check (0 = disabled)
         if self._ttl > 0 and (now - loaded_at) > self._ttl:
-            async with self._global_lock:
-                self._cache.pop(oid, None)
+            segment.pop(oid, None)
             if self._verbose:
                 self._log.info("CACHE EXPIRED file_id=%s ttl=%ss", oid, self._ttl)
             return None
 
-        # Touch LRU timestamp
-        async with self._global_lock:
-            self._cache[oid] = (session, loaded_at, now)
-        return session
+        if self._slru and segment is self._cache:
+            # Second reference: promote to protected, demoting its LRU entry if full.
+            del self._cache[oid]
+            self._protected[oid] = tpl
+            if len(self._protected) > self._protected_max:
+                demoted, dtpl = self._protected.popitem(last=False)
+                self._cache[demoted] = dtpl
+        else:
+            # Touch LRU position
+            segment.move_to_end(oid)
+        return session, meta
 
-    def _evict_if_needed(self, now: float) -> None:
-        """Evict least-recently-used entries until size <= max."""
+    def _evict_if_needed(self) -> None:
+        """Evict least-recently-used entries (probationary segment first) until size <= max."""
         if self._max <= 0:
             return
-        while len(self._cache) > self._max:
-            # Find entry with the oldest 'last_used' (LRU)
-            oldest_oid: ObjectId | None = None
-            oldest_last_used = float("inf")
-            for oid, (_sess, _loaded_at, last_used) in self._cache.items():
-                if last_used < oldest_last_used:
-                    oldest_last_used = last_used
-                    oldest_oid = oid
-            if oldest_oid is None:
-                break
-            self._cache.pop(oldest_oid, None)
+        while len(self._cache) + len(self._protected) > self._max:
+            victims = self._cache or self._protected
+            oldest_oid, _ = victims.popitem(last=False)
             if self._verbose:
                 self._log.info("CACHE EVICT file_id=%s", oldest_oid)
 
@@ -205,11 +307,13 @@ class ModelCache:
         """Remove a single entry from the cache (best effort)."""
         oid = self._normalize_id(file_id)
         self._cache.pop(oid, None)
+        self._protected.pop(oid, None)
         if self._verbose:
             self._log.info("CACHE INVALIDATE file_id=%s", oid)
 
     def clear(self) -> None:
         """Clear the entire cache (best effort)."""
         self._cache.clear()
+        self._protected.clear()
         if self._verbose:
             self._log.info("CACHE CLEAR all")
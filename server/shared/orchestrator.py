@@ -2,7 +2,16 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from itertools import chain
+from dataclasses import dataclass, field
 from typing import Any, List, Sequence, Optional
 
 import numpy as np
@@ -13,6 +22,8 @@ from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 import inference_pb2 as pb
 from .model_cache import ModelCache
 
+log = logging.getLogger("orchestrator")
+
 
 # Domain errors surfaced to API layers.
 
@@ -72,49 +83,364 @@ PROTO_TO_NP = {
 }
 
 
-def _shape_compatible(expected, actual) -> bool:
-    """Return True when actual shape matches expected, treating None/-1/symbolic as wildcards."""
-    try:
-        exp = list(expected)
-        act = list(actual)
-    except Exception:
-        return False
-    if len(exp) != len(act):
-        return False
-    for e, a in zip(exp, act):
-        if e in (None, -1, "None"):
-            continue
-        if isinstance(e, str):  # symbolic name
-            continue
-        if int(e) != int(a):
-            return False
-    return True
+def _shape_validator(expected) -> tuple[tuple[int, int], ...]:
+    """Return (axis, size) pairs for the fixed dims of expected; None/-1/symbolic dims are wildcards."""
+    return tuple(
+        (i, int(e)) for i, e in enumerate(expected)
+        if e not in (None, -1, "None") and not isinstance(e, str)
+    )
 
 
 def _numpy_from_bytes(buf: bytes, dims: Sequence[int], dtype: np.dtype) -> np.ndarray:
     """Rebuild a C-contiguous NumPy array from raw bytes and dims, validating size."""
-    dims = [int(d) for d in dims]               # ensure plain ints
+    dims = tuple(map(int, dims))                # ensure plain ints
     if not dims:
         raise InvalidInputError("input.dims must be provided and non-empty.")
 
-    # validate total byte size using pure-Python types (keeps type-checkers happy)
-    elems = 1
-    for d in dims:
-        elems *= int(d)
-    elem_size = 1 if dtype == np.dtype(np.bool_) else int(dtype.itemsize)
+    # validate total byte size using pure-Python ints
+    elems = math.prod(dims)
+    elem_size = 1 if dtype.kind == "b" else dtype.itemsize
     expected = elems * elem_size
     if len(buf) != expected:
         raise InvalidInputError(
             f"tensor_content size {len(buf)} != prod(dims) {elems} * elem_size {elem_size}"
         )
 
-    mv = memoryview(buf)
+    # frombuffer views buf (already C-contiguous); reshape of a 1-D contiguous view is free.
+    # uint8 and bool_ share an itemsize, so bool inputs are a zero-copy view as well.
     if dtype == np.dtype(np.bool_):
-        arr = np.frombuffer(mv, dtype=np.uint8).astype(np.bool_, copy=False)
+        arr = np.frombuffer(buf, dtype=np.uint8).view(np.bool_)
     else:
-        arr = np.frombuffer(mv, dtype=dtype)
+        arr = np.frombuffer(buf, dtype=dtype)
+    arr = arr.reshape(dims)
+    assert arr.flags.c_contiguous
+    return arr
+
+
+# Below this many elements np.asarray's own shape discovery is cheaper than the walk.
+_FROMITER_MIN_ELEMS = 65536
+
+
+def _array_from_nested(data: Any, dtype: np.dtype) -> np.ndarray:
+    """
+    Convert a JSON nested list to an ndarray of dtype.
+
+    Large rectangular inputs are walked one level at a time (checking row lengths) and
+    filled with a single np.fromiter over the flattened leaves; everything else, including
+    ragged or malformed input, goes through np.asarray so errors are unchanged.
+    ndarrays that already have dtype and C order are used as-is (no copy).
+    """
+    if isinstance(data, np.ndarray):
+        if data.dtype == dtype and data.flags.c_contiguous:
+            return data
+        return np.ascontiguousarray(data, dtype=dtype)
+    if type(data) is not list or not data or type(data[0]) is not list:
+        return np.asarray(data, dtype=dtype)
+    level = data
+    shape = [len(data)]
+    while True:
+        k = len(level[0])
+        if k == 0 or any(type(r) is not list or len(r) != k for r in level):
+            return np.asarray(data, dtype=dtype)
+        shape.append(k)
+        if type(level[0][0]) is not list:
+            break
+        level = list(chain.from_iterable(level))
+    n = math.prod(shape)
+    if n < _FROMITER_MIN_ELEMS:
+        return np.asarray(data, dtype=dtype)
+    try:
+        return np.fromiter(chain.from_iterable(level), dtype=dtype, count=n).reshape(shape)
+    except (TypeError, ValueError):
+        return np.asarray(data, dtype=dtype)
+
+
+# Per-run options shared by every session.run call.
+
+def _build_run_options() -> ort.RunOptions | None:
+    """
+    RunOptions that shrink the CPU arena after each run, when the arena is enabled.
+
+    Shrinking returns the run's arena growth to the OS (lower idle RSS across many cached
+    models) at the cost of re-growing it on the next run. ORT_ARENA_SHRINK=0 opts out.
+    """
+    arena = os.environ.get("ORT_CPU_MEM_ARENA", "0") == "1"
+    if not arena or os.environ.get("ORT_ARENA_SHRINK", "1") != "1":
+        return None
+    ro = ort.RunOptions()
+    ro.add_run_config_entry("memory.enable_memory_arena_shrinkage", "cpu:0")
+    return ro
+
+
+RUN_OPTIONS = _build_run_options()
+
+
+# Reusable output buffers (IOBinding), one per input shape.
+
+# Opt out with ORT_IO_BINDING=0 (e.g., when callers need to hold outputs across awaits).
+IO_BINDING_ENABLED = os.environ.get("ORT_IO_BINDING", "1") == "1"
+# Upper bound on the output buffers one session keeps bound (bytes, across all its shapes).
+IO_BINDING_MAX_BYTES = int(os.environ.get("ORT_IO_BINDING_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class SessionBinding:
+    """
+    IOBinding that writes output[0] into preallocated buffers, one slot per input shape.
+
+    Static-shape models get their single slot up front. For dynamic models the first call
+    with a new input shape runs unbound to learn the output shape and later calls with that
+    shape reuse a slot. Slots are kept in LRU order, capped at MAX_SHAPES and at
+    IO_BINDING_MAX_BYTES of buffers in total; an output larger than the budget is never
+    bound. If a bound run fails (e.g. a data-dependent
+    output shape), only that shape's slot is dropped and the caller falls back to
+    session.run; binding is disabled for the session after MAX_FAILURES failures in a row.
+
+    The array returned by run() is owned by the binding and overwritten by the next call
+    with the same input shape, so callers must consume it before yielding to the event loop.
+
+    Only a weak reference to the session is kept: the orchestrator maps sessions to bindings
+    in a WeakKeyDictionary, and a strong one would keep evicted sessions (and buffers) alive.
+    """
+
+    MAX_SHAPES = 8
+    MAX_FAILURES = 3
+
+    def __init__(self, session: ort.InferenceSession, out_name: str, out_dtype: np.dtype, static_shape: tuple | None):
+        self._session_ref = weakref.ref(session)
+        self._busy = threading.Lock()
+        self._out_name = out_name
+        self._out_dtype = out_dtype
+        self._static = static_shape
+        self._slots: OrderedDict[tuple, tuple[Any, np.ndarray]] = OrderedDict()
+        self._slot_bytes = 0
+        self._disabled = False
+        self._failures = 0  # consecutive failed bound runs
+        if static_shape is not None:
+            self._add_slot(session, (), static_shape)
+
+    def _add_slot(self, session: ort.InferenceSession, key: tuple, out_shape: tuple) -> None:
+        """Bind a buffer for key, evicting least recently used slots to stay within the caps."""
+        nbytes = math.prod(out_shape) * self._out_dtype.itemsize
+        if nbytes > IO_BINDING_MAX_BYTES:
+            return  # too large to pin; this shape always runs unbound
+        while self._slots and (len(self._slots) >= self.MAX_SHAPES
+                               or self._slot_bytes + nbytes > IO_BINDING_MAX_BYTES):
+            _, (_, old) = self._slots.popitem(last=False)
+            self._slot_bytes -= old.nbytes
+        self._slots[key] = self._make_slot(session, out_shape)
+        self._slot_bytes += nbytes
+
+    def _make_slot(self, session: ort.InferenceSession, out_shape: tuple) -> tuple[Any, np.ndarray]:
+        """Allocate an output buffer and an IOBinding whose output[0] points at it."""
+        io = session.io_binding()
+        out = np.empty(out_shape, dtype=self._out_dtype)
+        io.bind_output(self._out_name, "cpu", 0, self._out_dtype.type, list(out_shape), out.ctypes.data)
+        return io, out
+
+    @classmethod
+    def for_session(cls, session: ort.InferenceSession) -> "SessionBinding | None":
+        """Return a binding when output[0] has a known dtype, else None."""
+        out_meta = session.get_outputs()[0]
+        out_dtype = ONNX_TO_NP.get(out_meta.type or "")
+        if out_dtype is None:
+            return None
+        shape = out_meta.shape or []
+        static = bool(shape) and all(isinstance(d, int) and d >= 0 for d in shape)
+        return cls(session, out_meta.name, out_dtype, tuple(shape) if static else None)
+
+    def run(self, in_name: str, arr: np.ndarray) -> np.ndarray | None:
+        """
+        Run the session for arr and return output[0], from a shared buffer when possible.
+
+        Returns None without running when the binding is disabled or already in use (e.g. a caller running sessions from worker threads); the caller then falls
+        back to session.run.
+        """
+        session = self._session_ref()
+        if session is None or self._disabled or not self._busy.acquire(blocking=False):
+            return None
+        try:
+            key = () if self._static is not None else arr.shape
+            slot = self._slots.get(key)
+            if slot is None:
+                # Learn the output shape for this input shape; this call's result is fresh.
+                out = np.asarray(session.run([self._out_name], {in_name: arr}, RUN_OPTIONS)[0])
+                if out.dtype == self._out_dtype:
+                    self._add_slot(session, key, out.shape)
+                return out
+            self._slots.move_to_end(key)
+            io, out = slot
+            io.bind_cpu_input(in_name, arr)
+            try:
+                session.run_with_iobinding(io, RUN_OPTIONS)
+            except Exception:
+                if self._static is not None:
+                    raise
+                # Maybe transient or data-dependent: forget this shape only. Repeated failures
+                # mean output shape is not a function of input shape; stop binding then.
+                del self._slots[key]
+                self._slot_bytes -= out.nbytes
+                self._failures += 1
+                if self._failures >= self.MAX_FAILURES:
+                    self._disabled = True
+                    self._slots.clear()
+                    self._slot_bytes = 0
+                return None
+            finally:
+                io.clear_binding_inputs()  # do not keep the request tensor alive
+            self._failures = 0
+            return out
+        finally:
+            self._busy.release()
+
+
+# Dynamic micro-batching for models with a symbolic leading (batch) dimension.
+
+# Off unless NEXON_MAX_BATCH > 1; a request waits at most NEXON_BATCH_TIMEOUT_MS for company.
+MAX_BATCH = int(os.environ.get("NEXON_MAX_BATCH", "1"))
+BATCH_TIMEOUT_MS = float(os.environ.get("NEXON_BATCH_TIMEOUT_MS", "2"))
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests for one session into a single run stacked along axis 0.
+
+    Requests are queued per trailing shape/dtype so only compatible tensors are stacked.
+    A drain task lives while its queue has work: it takes the first request, waits up to
+    the timeout for more rows (capped at max_batch), runs once, and hands each caller its
+    slice of output[0]. Slices view a fresh array, so they stay valid across awaits.
+
+    The session is held weakly, as in SessionBinding; callers awaiting submit() keep it
+    alive until their batch has run.
+    """
+
+    def __init__(self, session: ort.InferenceSession, max_batch: int, timeout_s: float):
+        self._session_ref = weakref.ref(session)
+        self._in_name = session.get_inputs()[0].name
+        self._out_name = session.get_outputs()[0].name
+        self._max_batch = max_batch
+        self._timeout_s = timeout_s
+        self._queues: dict[tuple, asyncio.Queue] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def for_session(cls, session: ort.InferenceSession, max_batch: int, timeout_s: float) -> "MicroBatcher | None":
+        """Return a batcher when input[0] and output[0] both have a symbolic batch dim, else None."""
+        in_shape = session.get_inputs()[0].shape or []
+        out_shape = session.get_outputs()[0].shape or []
+        if not in_shape or not out_shape or isinstance(in_shape[0], int) or isinstance(out_shape[0], int):
+            return None
+        return cls(session, max_batch, timeout_s)
+
+    async def submit(self, arr: np.ndarray) -> np.ndarray:
+        """Queue arr (leading dim = rows) and return its rows of output[0]."""
+        key = (arr.shape[1:], arr.dtype.str)
+        fut = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue()
+            task = asyncio.create_task(self._drain(key, queue))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        queue.put_nowait((arr, fut))
+        return await fut
+
+    async def _drain(self, key: tuple, queue: asyncio.Queue) -> None:
+        """Form and run batches until the queue is empty, then retire the queue."""
+        loop = asyncio.get_running_loop()
+        items: list = []
+        try:
+            while not queue.empty():
+                items = [queue.get_nowait()]
+                rows = items[0][0].shape[0]
+                deadline = loop.time() + self._timeout_s
+                while rows < self._max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    items.append(item)
+                    rows += item[0].shape[0]
+                self._run(items)
+                items = []
+        finally:
+            # No await between the empty() check above and this pop, so no request is stranded.
+            self._queues.pop(key, None)
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(RuntimeError("Batch was cancelled."))
+
+    def _run(self, items: list) -> None:
+        """Run one stacked batch and resolve each request's future with its slice."""
+        arrs = [a for a, _ in items]
+        batch = arrs[0] if len(arrs) == 1 else np.concatenate(arrs, axis=0)
+        try:
+            session = self._session_ref()
+            if session is None:
+                raise RuntimeError("Model session was evicted.")
+            out = np.asarray(session.run([self._out_name], {self._in_name: batch}, RUN_OPTIONS)[0])
+            if len(arrs) > 1 and (out.ndim == 0 or out.shape[0] != batch.shape[0]):
+                raise RuntimeError("Batched output[0] leading dim does not match the batch size.")
+        except Exception as e:
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        if len(arrs) == 1:
+            if not items[0][1].done():
+                items[0][1].set_result(out)
+            return
+        start = 0
+        for a, fut in items:
+            stop = start + a.shape[0]
+            if not fut.done():  # caller may have been cancelled
+                fut.set_result(out[start:stop])
+            start = stop
+
+
+# Per-session input/output metadata, resolved once at load time.
+
+@dataclass(frozen=True, slots=True)
+class SessionMeta:
+    """ORT input[0]/output[0] metadata cached alongside each session by ModelCache."""
+    in_name: str
+    onnx_dt: str
+    np_dtype: np.dtype | None  # None when the ONNX input type is unsupported
+    exp_shape: list
+    out0_name: str
+    fixed_dims: tuple[tuple[int, int], ...]  # (axis, size) for non-wildcard dims of exp_shape
+
+    @classmethod
+    def from_session(cls, session: ort.InferenceSession) -> "SessionMeta":
+        """
+        Read input[0]/output[0] metadata from a freshly loaded session.
+
+        The NumPy dtype is resolved here, once per load. An unsupported input type is
+        reported now rather than on first use, but the session is still cached: requests
+        then fail on a single None check instead of reloading the model every time.
+        """
+        in_meta = session.get_inputs()[0]
+        onnx_dt = in_meta.type or ""
+        np_dtype = ONNX_TO_NP.get(onnx_dt)
+        if np_dtype is None:
+            log.warning("Model input '%s' has unsupported type %s; requests will be rejected.",
+                        in_meta.name, onnx_dt or "<unknown>")
+        return cls(
+            in_name=in_meta.name,
+            onnx_dt=onnx_dt,
+            np_dtype=np_dtype,
+            exp_shape=in_meta.shape,
+            out0_name=session.get_outputs()[0].name,
+            fixed_dims=_shape_validator(in_meta.shape or ()),
+        )
 
-    return np.ascontiguousarray(arr).reshape(tuple(dims))
+    def shape_ok(self, shape: tuple) -> bool:
+        """Return True when shape matches exp_shape (always True when the model declares none)."""
+        if not self.exp_shape:
+            return True
+        return len(shape) == len(self.exp_shape) and all(shape[i] == d for i, d in self.fixed_dims)
 
 
 # Orchestrator implementation.
@@ -129,30 +455,85 @@ class InferenceOrchestrator:
     models_collection: Any
     gridfs_bucket: AsyncIOMotorGridFSBucket
     _cache: ModelCache | None = None
+    # session -> SessionBinding (or None when output[0] has an unsupported dtype)
+    _bindings: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary)
+    # session -> MicroBatcher (or None when the model has no symbolic batch dim)
+    _batchers: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary)
+    # model_name -> (deployed file_id, resolved_at monotonic); only successful lookups are cached
+    _name_cache: dict = field(default_factory=dict)
+    _name_ttl: float = field(default_factory=lambda: float(os.environ.get("NEXON_NAME_CACHE_TTL", "5")))
 
     @property
     def cache(self) -> ModelCache:
         """Return the lazily constructed ModelCache."""
         if self._cache is None:
-            self._cache = ModelCache(gridfs_db=self.gridfs_bucket)
+            self._cache = ModelCache(gridfs_db=self.gridfs_bucket, meta_factory=SessionMeta.from_session)
         return self._cache
 
+    def invalidate_name(self, model_name: str) -> None:
+        """Forget the cached deployed file_id for model_name (call after undeploy/delete)."""
+        self._name_cache.pop(model_name, None)
+
     async def _resolve_deployed_file_id(self, model_name: str) -> ObjectId:
-        """Return the GridFS file_id for the deployed version of model_name."""
+        """
+        Return the GridFS file_id for the deployed version of model_name.
+
+        Successful lookups are cached for NEXON_NAME_CACHE_TTL seconds (default 5; 0 disables),
+        so a deployment change made by another process is picked up within that window.
+        """
+        if self._name_ttl > 0:
+            cached = self._name_cache.get(model_name)
+            if cached is not None and time.monotonic() - cached[1] < self._name_ttl:
+                return cached[0]
+        fid = await self._query_deployed_file_id(model_name)
+        if self._name_ttl > 0:
+            self._name_cache[model_name] = (fid, time.monotonic())
+        return fid
+
+    async def _query_deployed_file_id(self, model_name: str) -> ObjectId:
+        """Look up the deployed version of model_name in MongoDB."""
         docs = await self.models_collection.find({"name": model_name}).to_list(None)
         if not docs:
             raise ModelNotFoundError(f"Model '{model_name}' does not exist.")
         for d in docs:
             if d.get("status") == "Deployed":
-                return ObjectId(str(d["file_id"]))
+                fid = d["file_id"]
+                # Motor already returns ObjectId; only legacy string ids need parsing.
+                return fid if isinstance(fid, ObjectId) else ObjectId(str(fid))
         raise ModelNotDeployedError(f"Model '{model_name}' has no deployed version.")
 
-    async def _load_session(self, file_id: ObjectId) -> ort.InferenceSession:
-        """Retrieve an ONNX Runtime session from the shared cache."""
-        sess = await self.cache.get_session(file_id)
+    async def _load_session(self, file_id: ObjectId) -> tuple[ort.InferenceSession, SessionMeta]:
+        """Retrieve an ONNX Runtime session and its metadata from the shared cache."""
+        sess, meta = await self.cache.get_session_and_meta(file_id)
         if sess is None:
             raise RuntimeError("Failed to load ONNX session from cache.")
-        return sess
+        return sess, meta
+
+    def _run_session(self, session: ort.InferenceSession, meta: SessionMeta, arr: np.ndarray) -> List[np.ndarray]:
+        """Run output[0], reusing a bound output buffer for input shapes seen before."""
+        if IO_BINDING_ENABLED:
+            binding = self._bindings.get(session, False)
+            if binding is False:
+                binding = self._bindings[session] = SessionBinding.for_session(session)
+            if binding is not None:
+                out = binding.run(meta.in_name, arr)
+                if out is not None:
+                    return [out]
+
+        outputs = session.run([meta.out0_name], {meta.in_name: arr}, RUN_OPTIONS)
+        return [np.asarray(outputs[0])]
+
+    async def _execute(self, session: ort.InferenceSession, meta: SessionMeta, arr: np.ndarray) -> List[np.ndarray]:
+        """Route through the session's micro-batcher when enabled and applicable, else run directly."""
+        if MAX_BATCH > 1 and arr.ndim:
+            batcher = self._batchers.get(session, False)
+            if batcher is False:
+                batcher = self._batchers[session] = MicroBatcher.for_session(
+                    session, MAX_BATCH, BATCH_TIMEOUT_MS / 1000.0
+                )
+            if batcher is not None:
+                return [await batcher.submit(arr)]
+        return self._run_session(session, meta, arr)
 
     # REST path: JSON lists -> NumPy (Option B': optional dtype).
     async def run(
@@ -167,11 +548,12 @@ class InferenceOrchestrator:
 
         Args:
             model_name: Registered model identifier.
-            input_data: JSON-compatible nested lists representing input[0].
+            input_data: JSON-compatible nested lists (or an np.ndarray) representing input[0].
             request_dtype_str: Optional dtype string supplied by REST clients.
 
         Returns:
-            List containing output[0] as a NumPy array.
+            List containing output[0] as a NumPy array. This may be the session's reused output
+            buffer for the input shape; consume it before the next await.
 
         Raises:
             ModelNotFoundError: When the model does not exist.
@@ -179,12 +561,10 @@ class InferenceOrchestrator:
             InvalidInputError: When dtype, shape, or name validation fails.
         """
         file_id = await self._resolve_deployed_file_id(model_name)
-        session = await self._load_session(file_id)
+        session, meta = await self._load_session(file_id)
 
-        in_meta = session.get_inputs()[0]
-        in_name = in_meta.name
-        onnx_dt = in_meta.type or ""
-        np_dtype = ONNX_TO_NP.get(onnx_dt)
+        onnx_dt = meta.onnx_dt
+        np_dtype = meta.np_dtype
         if np_dtype is None:
             raise InvalidInputError(f"Unsupported ONNX input dtype: {onnx_dt}")
 
@@ -199,19 +579,16 @@ class InferenceOrchestrator:
                 )
 
         try:
-            arr = np.asarray(input_data, dtype=np_dtype)
+            arr = _array_from_nested(input_data, np_dtype)
         except Exception as e:
             raise InvalidInputError(f"Failed to cast input to {onnx_dt}: {e}")
 
-        exp_shape = in_meta.shape
-        if exp_shape and not _shape_compatible(exp_shape, arr.shape):
+        if not meta.shape_ok(arr.shape):
             raise InvalidInputError(
-                f"Input shape mismatch. Expected ~ {exp_shape}, received {list(arr.shape)}."
+                f"Input shape mismatch. Expected ~ {meta.exp_shape}, received {list(arr.shape)}."
             )
 
-        out0_name = session.get_outputs()[0].name
-        outputs = session.run([out0_name], {in_name: arr})
-        return [np.asarray(outputs[0])]
+        return await self._execute(session, meta, arr)
 
     # gRPC path: raw bytes + dims -> NumPy (Option B': optional dtype).
     async def run_from_bytes(
@@ -234,7 +611,8 @@ class InferenceOrchestrator:
             request_dtype: Optional np.dtype derived from proto enumeration.
 
         Returns:
-            List containing output[0] as a NumPy array.
+            List containing output[0] as a NumPy array (always an np.ndarray). This may be the
+            session's reused output buffer for the input shape; consume it before the next await.
 
         Raises:
             ModelNotFoundError: When the model does not exist.
@@ -242,12 +620,11 @@ class InferenceOrchestrator:
             InvalidInputError: When dtype, shape, or name validation fails.
         """
         file_id = await self._resolve_deployed_file_id(model_name)
-        session = await self._load_session(file_id)
+        session, meta = await self._load_session(file_id)
 
-        in_meta = session.get_inputs()[0]
-        in_name = in_meta.name
-        onnx_dt = in_meta.type or ""
-        np_dtype = ONNX_TO_NP.get(onnx_dt)
+        in_name = meta.in_name
+        onnx_dt = meta.onnx_dt
+        np_dtype = meta.np_dtype
         if np_dtype is None:
             raise InvalidInputError(f"Unsupported ONNX input dtype: {onnx_dt}")
 
@@ -261,15 +638,11 @@ class InferenceOrchestrator:
                 f"dtype mismatch: request {request_dtype} vs model {onnx_dt}"
             )
 
-        dims = [int(d) for d in dims]
         arr = _numpy_from_bytes(raw_bytes, dims, np_dtype)
 
-        exp_shape = in_meta.shape
-        if exp_shape and not _shape_compatible(exp_shape, arr.shape):
+        if not meta.shape_ok(arr.shape):
             raise InvalidInputError(
-                f"Input shape mismatch. Expected ~ {exp_shape}, received {list(arr.shape)}."
+                f"Input shape mismatch. Expected ~ {meta.exp_shape}, received {list(arr.shape)}."
             )
 
-        out0_name = session.get_outputs()[0].name
-        outputs = session.run([out0_name], {in_name: arr})
-        return [np.asarray(outputs[0])]
+        return await self._execute(session, meta, arr)
@@ -25,8 +25,14 @@ DTYPE_MAP = {
     "int64":   np.int64,
 }
 
+# byteorder codes that already mean little-endian on this host ("=" is native)
+_LE_ORDERS = ("<", "|", "=") if sys.byteorder == "little" else ("<", "|")
+
 def to_le_bytes(arr: np.ndarray) -> bytes:
     """Return row-major LITTLE-ENDIAN bytes for the provided NumPy array."""
+    # fast path: already little-endian and C-contiguous -> a single tobytes() copy
+    if arr.dtype.byteorder in _LE_ORDERS and arr.flags.c_contiguous:
+        return arr.tobytes()
     # make contiguous, enforce little-endian for academic rigor
     le = arr.dtype.newbyteorder("<")
     return np.ascontiguousarray(arr.astype(le, copy=False)).tobytes(order="C")
@@ -34,32 +40,41 @@ def to_le_bytes(arr: np.ndarray) -> bytes:
 def b64_bytes(b: bytes) -> str:
     return base64.b64encode(b).decode("ascii")
 
+def _const(arr: np.ndarray) -> np.ndarray:
+    """Freeze a module-level case array so callers cannot mutate shared state."""
+    arr.flags.writeable = False
+    return arr
+
+# case tensors are built once at import; build_case just looks them up
+_SIGMOID_ARR = _const(np.array([
+    [[0.90611831,0.55083885,0.60356778,0.4017955,0.93486481],
+     [0.4901685,0.13770382,0.18119458,0.96234953,0.73380571],
+     [0.45169349,0.43948672,0.42517826,0.66069703,0.03820433],
+     [0.03415621,0.20126882,0.12834833,0.40389847,0.91753817]],
+    [[0.35571745,0.00176035,0.50712222,0.8112738,0.87369624],
+     [0.72933191,0.90544295,0.42246992,0.40272341,0.32540792],
+     [0.81075661,0.63102424,0.2854389,0.70343316,0.40121651],
+     [0.91779477,0.42282643,0.28781966,0.72246921,0.2001259]],
+    [[0.48461046,0.17440038,0.65646471,0.45603641,0.35819514],
+     [0.41587646,0.16148726,0.66821656,0.6465515,0.72218574],
+     [0.98868071,0.5001877,0.98337036,0.06299395,0.53611984],
+     [0.33656247,0.69934775,0.59331723,0.7628454,0.1131932]],
+], dtype=np.float32))
+_MEDIUM_1X1 = _const(np.full((1, 1), 50022, dtype=np.float32))
+_GPT2_1X1 = _const(np.array([[50256]], dtype=np.int64))
+
+# case name -> (array, dtype name)
+CASES: Dict[str, tuple[np.ndarray, str]] = {
+    "sigmoid":    (_SIGMOID_ARR, "float32"),
+    "medium_1x1": (_MEDIUM_1X1, "float32"),
+    "gpt2_1x1":   (_GPT2_1X1, "int64"),
+}
+
 def build_case(name: str) -> Dict[str, Any]:
-    if name == "sigmoid":
-        data = [
-            [[0.90611831,0.55083885,0.60356778,0.4017955,0.93486481],
-             [0.4901685,0.13770382,0.18119458,0.96234953,0.73380571],
-             [0.45169349,0.43948672,0.42517826,0.66069703,0.03820433],
-             [0.03415621,0.20126882,0.12834833,0.40389847,0.91753817]],
-            [[0.35571745,0.00176035,0.50712222,0.8112738,0.87369624],
-             [0.72933191,0.90544295,0.42246992,0.40272341,0.32540792],
-             [0.81075661,0.63102424,0.2854389,0.70343316,0.40121651],
-             [0.91779477,0.42282643,0.28781966,0.72246921,0.2001259]],
-            [[0.48461046,0.17440038,0.65646471,0.45603641,0.35819514],
-             [0.41587646,0.16148726,0.66821656,0.6465515,0.72218574],
-             [0.98868071,0.5001877,0.98337036,0.06299395,0.53611984],
-             [0.33656247,0.69934775,0.59331723,0.7628454,0.1131932]],
-        ]
-        arr = np.array(data, dtype=np.float32)
-        dtype = "float32"
-    elif name == "medium_1x1":
-        arr = np.full((1, 1), 50022, dtype=np.float32)
-        dtype = "float32"
-    elif name == "gpt2_1x1":
-        arr = np.array([[50256]], dtype=np.int64)
-        dtype = "int64"
-    else:
-        raise ValueError(f"Unknown case: {name}")
+    try:
+        arr, dtype = CASES[name]
+    except KeyError:
+        raise ValueError(f"Unknown case: {name}") from None
 
     raw = to_le_bytes(arr)
     expected = int(arr.size) * int(arr.dtype.itemsize)
@@ -70,7 +85,7 @@ def build_case(name: str) -> Dict[str, Any]:
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Emit deterministic test tensors as JSON.")
-    p.add_argument("--case", required=True, choices=["sigmoid", "medium_1x1", "gpt2_1x1"])
+    p.add_argument("--case", required=True, choices=list(CASES))
     p.add_argument("--out", help="Write JSON to this path (default: stdout)")
     p.add_argument("--indent", type=int, default=None, help="Pretty-print JSON with given indent")
     return p.parse_args()
@@ -8,18 +8,29 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import itertools
 import json
 import os
+import sys
 import time
-from typing import List, Tuple, Optional, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, cast
 
-import grpc
 import numpy as np
-import requests
-import yaml  # PyYAML
+from google.protobuf.internal import api_implementation
 
 import inference_pb2 as pb
-import inference_pb2_grpc as pb_grpc
+
+# grpc, httpx and yaml are imported where first used: each costs 15-50 ms at startup, and a
+# REST-only (or --help) run never needs grpc, just as a gRPC-only run never needs httpx.
+if TYPE_CHECKING:
+    import grpc
+    import httpx
+    import inference_pb2_grpc as pb_grpc
+
+try:
+    import orjson  # reads ndarray buffers directly; no tolist()
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
 
 GRPC_OPTS = [
@@ -27,6 +38,13 @@ GRPC_OPTS = [
     ("grpc.max_receive_message_length", 200 * 1024 * 1024), # 200 MiB
 ]
 
+# --compression choice -> grpc.Compression member (looked up lazily, see imports)
+GRPC_COMPRESSION = {
+    "none":    "NoCompression",
+    "gzip":    "Gzip",
+    "deflate": "Deflate",
+}
+
 # Type maps (protobuf enum <-> NumPy dtype)
 PB_TO_NP = {
     pb.DT_FLOAT32: np.float32,
@@ -36,15 +54,20 @@ PB_TO_NP = {
     pb.DT_BOOL:    np.bool_,
 }
 NP_TO_PB = {v: k for k, v in PB_TO_NP.items()}
+# Enum values are small non-negative ints: decode paths index this instead of hashing.
+_PB_TO_NP_TBL = tuple(PB_TO_NP.get(i) for i in range(max(PB_TO_NP) + 1))
 
 # Byte/array helpers
+_LE_ORDERS = ("<", "|", "=") if sys.byteorder == "little" else ("<", "|")
+
 def as_le_bytes(arr: np.ndarray) -> bytes:
     """Return little-endian row-major bytes for the provided NumPy array."""
-    if arr.dtype == np.bool_:
-        # Booleans are transported as bytes.
-        return np.ascontiguousarray(arr.astype(np.uint8, copy=False)).tobytes(order="C")
-    le = arr.dtype.newbyteorder("<")
-    return np.ascontiguousarray(arr.astype(le, copy=False)).tobytes(order="C")
+    if not arr.flags.c_contiguous:
+        arr = np.ascontiguousarray(arr)  # one gather copy before any byteswap
+    # Common case: already little-endian (bool_ is one 0/1 byte, same as its uint8 transport).
+    if arr.dtype.byteorder in _LE_ORDERS:
+        return arr.tobytes()
+    return arr.astype(arr.dtype.newbyteorder("<")).tobytes()
 
 def numpy_to_request_tensor(x: np.ndarray, name: str = "") -> pb.RequestTensor:
     """Construct a protobuf RequestTensor from a NumPy array."""
@@ -52,128 +75,310 @@ def numpy_to_request_tensor(x: np.ndarray, name: str = "") -> pb.RequestTensor:
 
 def response_tensor_to_numpy(t: pb.ResponseTensor) -> np.ndarray:
     """Convert a protobuf ResponseTensor back into a NumPy array."""
-    np_dtype = PB_TO_NP.get(t.data_type)
+    dt = t.data_type
+    np_dtype = _PB_TO_NP_TBL[dt] if 0 <= dt < len(_PB_TO_NP_TBL) else None
     if np_dtype is None:
-        raise ValueError(f"Unsupported response dtype enum: {t.data_type}")
+        raise ValueError(f"Unsupported response dtype enum: {dt}")
     arr = np.frombuffer(t.tensor_content, dtype=np_dtype)
-    return arr.reshape(tuple(t.dims), order="C")
+    dims = t.dims
+    if len(dims) == 1 and arr.shape[0] == dims[0]:
+        return arr  # frombuffer is already 1-D and C-ordered
+    return arr.reshape(tuple(dims))  # C order is the default
+
+def response_tensors_to_numpy(tensors: Sequence[pb.ResponseTensor]) -> List[np.ndarray]:
+    """Convert all reply outputs; same-dtype outputs share one contiguous backing buffer.
+
+    A single output is returned as a zero-copy view over its bytes. Several outputs of one
+    dtype are copied once into a single allocation so later passes walk one region.
+    """
+    if len(tensors) < 2 or len({t.data_type for t in tensors}) != 1:
+        return [response_tensor_to_numpy(t) for t in tensors]
+    dt = tensors[0].data_type
+    np_dtype = _PB_TO_NP_TBL[dt] if 0 <= dt < len(_PB_TO_NP_TBL) else None
+    if np_dtype is None:
+        raise ValueError(f"Unsupported response dtype enum: {dt}")
+    itemsize = np.dtype(np_dtype).itemsize
+    buf = np.empty(sum(len(t.tensor_content) for t in tensors) // itemsize, dtype=np_dtype)
+    raw = buf.view(np.uint8)
+    outs: List[np.ndarray] = []
+    off = 0
+    for t in tensors:
+        n = len(t.tensor_content)
+        raw[off:off + n] = np.frombuffer(t.tensor_content, dtype=np.uint8)
+        outs.append(buf[off // itemsize:(off + n) // itemsize].reshape(tuple(t.dims)))
+        off += n
+    return outs
+
+# JSON helpers (orjson when available)
+def dumps_input(x: np.ndarray) -> bytes:
+    """Serialize {"input": x} as JSON bytes for the REST endpoint."""
+    if orjson is not None and x.dtype.isnative:
+        return orjson.dumps({"input": np.ascontiguousarray(x)}, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps({"input": x.tolist()}).encode("utf-8")
+
+def loads_body(body: bytes):
+    """Parse a JSON response body."""
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+# Preset inputs (built once at import; read-only so callers cannot mutate the shared array)
+_SIGMOID = np.array([
+    [[0.90611831,0.55083885,0.60356778,0.4017955,0.93486481],
+     [0.4901685,0.13770382,0.18119458,0.96234953,0.73380571],
+     [0.45169349,0.43948672,0.42517826,0.66069703,0.03820433],
+     [0.03415621,0.20126882,0.12834833,0.40389847,0.91753817]],
+    [[0.35571745,0.00176035,0.50712222,0.8112738,0.87369624],
+     [0.72933191,0.90544295,0.42246992,0.40272341,0.32540792],
+     [0.81075661,0.63102424,0.2854389,0.70343316,0.40121651],
+     [0.91779477,0.42282643,0.28781966,0.72246921,0.2001259]],
+    [[0.48461046,0.17440038,0.65646471,0.45603641,0.35819514],
+     [0.41587646,0.16148726,0.66821656,0.6465515,0.72218574],
+     [0.98868071,0.5001877,0.98337036,0.06299395,0.53611984],
+     [0.33656247,0.69934775,0.59331723,0.7628454,0.1131932]],
+], dtype=np.float32)
+_SIGMOID.flags.writeable = False
 
-# Preset inputs
 def preset_sigmoid() -> np.ndarray:
     """Return the built-in sigmoid sample tensor for quick smoke testing."""
-    data = [
-        [[0.90611831,0.55083885,0.60356778,0.4017955,0.93486481],
-         [0.4901685,0.13770382,0.18119458,0.96234953,0.73380571],
-         [0.45169349,0.43948672,0.42517826,0.66069703,0.03820433],
-         [0.03415621,0.20126882,0.12834833,0.40389847,0.91753817]],
-        [[0.35571745,0.00176035,0.50712222,0.8112738,0.87369624],
-         [0.72933191,0.90544295,0.42246992,0.40272341,0.32540792],
-         [0.81075661,0.63102424,0.2854389,0.70343316,0.40121651],
-         [0.91779477,0.42282643,0.28781966,0.72246921,0.2001259]],
-        [[0.48461046,0.17440038,0.65646471,0.45603641,0.35819514],
-         [0.41587646,0.16148726,0.66821656,0.6465515,0.72218574],
-         [0.98868071,0.5001877,0.98337036,0.06299395,0.53611984],
-         [0.33656247,0.69934775,0.59331723,0.7628454,0.1131932]],
-    ]
-    return np.array(data, dtype=np.float32)
-
-# REST client (session reuse)
-_SESSION: Optional[requests.Session] = None
-
-def _get_session(fresh_conn: bool) -> requests.Session:
-    """Return a cached requests.Session unless fresh_conn forces a new handle."""
-    global _SESSION
-    if fresh_conn:
-        return requests.Session()
-    if _SESSION is None:
-        _SESSION = requests.Session()
-    return _SESSION
-
-def post_rest_infer(base_url: str, model_name: str, x: np.ndarray, fresh_conn: bool) -> Tuple[List, float, int, int]:
-    """Send a REST inference request and return response payload and timings."""
+    return _SIGMOID
+
+# REST client (connection reuse)
+_CLIENT: Optional[httpx.Client] = None
+_REST_HEADERS = {"Content-Type": "application/json"}
+
+def _new_client(http2: bool) -> httpx.Client:
+    """Create an HTTP client; http2 uses prior knowledge (h2c), which Envoy's AUTO codec accepts."""
+    import httpx
+    return httpx.Client(http1=not http2, http2=http2, timeout=60.0, headers=_REST_HEADERS)
+
+def _get_client(http2: bool) -> httpx.Client:
+    """Return the cached httpx.Client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = _new_client(http2)
+    return _CLIENT
+
+def post_rest_infer(base_url: str, model_name: str, data: bytes, fresh_conn: bool,
+                    http2: bool = False) -> Tuple[List, float, int, int]:
+    """Send a prebuilt REST inference body (see dumps_input) and return response payload and timings."""
     url = base_url.rstrip("/") + f"/{model_name}"
-    payload = {"input": x.tolist()}
-    data = json.dumps(payload).encode("utf-8")
     if fresh_conn:
-        # Ensure ephemeral session is closed after use.
-        with requests.Session() as s:
+        # Ensure ephemeral client is closed after use.
+        with _new_client(http2) as s:
             t0 = time.perf_counter()
-            r = s.post(url, headers={"Content-Type": "application/json"}, data=data, timeout=60)
+            r = s.post(url, content=data)
             elapsed = time.perf_counter() - t0
     else:
-        s = _get_session(fresh_conn=False)
+        s = _get_client(http2)
         t0 = time.perf_counter()
-        r = s.post(url, headers={"Content-Type": "application/json"}, data=data, timeout=60)
+        r = s.post(url, content=data)
         elapsed = time.perf_counter() - t0
     r.raise_for_status()
     body = r.content
-    obj = r.json()
+    obj = loads_body(body)
     return obj["results"], elapsed, len(data), len(body)
 
-# gRPC client (channel reuse)
-_GRPC_CHANNEL: Optional[grpc.aio.Channel] = None
-_GRPC_STUB: Optional[pb_grpc.InferenceServiceStub] = None
-_GRPC_ADDR: Optional[str] = None
-
-async def _get_grpc_stub(addr: str, fresh_conn: bool) -> pb_grpc.InferenceServiceStub:
-    """Return a cached gRPC stub unless fresh_conn forces a new channel."""
-    global _GRPC_CHANNEL, _GRPC_STUB, _GRPC_ADDR
+def post_rest_infer_bin(base_url: str, model_name: str, data: bytes, shape: Sequence[int],
+                        dtype: np.dtype, fresh_conn: bool,
+                        http2: bool = False) -> Tuple[List[np.ndarray], float, int, int]:
+    """POST raw little-endian tensor bytes to /infer_bin and decode the raw output[0] reply.
+
+    base_url is the JSON endpoint (.../inference/infer); the binary route is its _bin sibling.
+    """
+    url = base_url.rstrip("/") + f"_bin/{model_name}"
+    headers = {
+        "Content-Type": "application/octet-stream",
+        "X-Shape": ",".join(map(str, shape)),
+        "X-Dtype": np.dtype(dtype).name,
+    }
     if fresh_conn:
-        ch = grpc.aio.insecure_channel(addr)
-        return pb_grpc.InferenceServiceStub(ch)
-    if _GRPC_STUB is None or _GRPC_ADDR != addr:
-        _GRPC_ADDR = addr
-        _GRPC_CHANNEL = grpc.aio.insecure_channel(addr, options=GRPC_OPTS)
-        _GRPC_STUB = pb_grpc.InferenceServiceStub(_GRPC_CHANNEL)
-    return _GRPC_STUB
-
-async def predict_grpc(addr: str, model_name: str, x: np.ndarray,
-                       deadline_sec: float, wait_for_ready: bool,
-                       fresh_conn: bool) -> Tuple[List[np.ndarray], float, int, int]:
-    """Execute the gRPC Predict RPC and capture outputs, latency, and sizes."""
-    req = pb.PredictRequest(model_name=model_name, input=numpy_to_request_tensor(x))
-    req_bytes = req.SerializeToString()
-
+        with _new_client(http2) as s:
+            t0 = time.perf_counter()
+            r = s.post(url, content=data, headers=headers)
+            elapsed = time.perf_counter() - t0
+    else:
+        s = _get_client(http2)
+        t0 = time.perf_counter()
+        r = s.post(url, content=data, headers=headers)
+        elapsed = time.perf_counter() - t0
+    r.raise_for_status()
+    body = r.content
+    out_shape = tuple(int(d) for d in r.headers["x-shape"].split(",") if d)
+    out_dtype = np.dtype(r.headers["x-dtype"]).newbyteorder("<")
+    return [np.frombuffer(body, dtype=out_dtype).reshape(out_shape)], elapsed, len(data), len(body)
+
+# gRPC client (channel reuse): one channel + stub per (addr, options), for the whole process
+_CHANNEL_CACHE: Dict[tuple, grpc.aio.Channel] = {}
+_STUB_CACHE: Dict[tuple, pb_grpc.InferenceServiceStub] = {}
+
+def _get_grpc_stub(addr: str, options: Sequence[Tuple[str, Any]] = GRPC_OPTS) -> pb_grpc.InferenceServiceStub:
+    """Return the cached stub for (addr, options), opening its channel on first use."""
+    key = (addr, tuple(options))
+    stub = _STUB_CACHE.get(key)
+    if stub is None:
+        import grpc
+        import inference_pb2_grpc as pb_grpc
+        channel = _CHANNEL_CACHE[key] = grpc.aio.insecure_channel(addr, options=list(options))
+        stub = _STUB_CACHE[key] = pb_grpc.InferenceServiceStub(channel)
+    return stub
+
+async def close_grpc_channels() -> None:
+    """Close every cached channel (call before the event loop exits)."""
+    channels = list(_CHANNEL_CACHE.values())
+    _CHANNEL_CACHE.clear()
+    _STUB_CACHE.clear()
+    for channel in channels:
+        await channel.close()
+
+def build_predict_request(model_name: str, x: np.ndarray) -> pb.PredictRequest:
+    """Build the PredictRequest once; it is reused unchanged across --iters."""
+    return pb.PredictRequest(model_name=model_name, input=numpy_to_request_tensor(x))
+
+async def predict_grpc(addr: str, req: pb.PredictRequest, req_sz: int,
+                       deadline_sec: float, wait_for_ready: bool, fresh_conn: bool,
+                       compression: Optional[grpc.Compression] = None,
+                       ) -> Tuple[List[np.ndarray], float, int, int]:
+    """Execute the gRPC Predict RPC with a prebuilt request and capture outputs, latency, and sizes."""
     if fresh_conn:
+        import grpc
+        import inference_pb2_grpc as pb_grpc
         async with grpc.aio.insecure_channel(addr, options=GRPC_OPTS) as channel:
             stub = pb_grpc.InferenceServiceStub(channel)
             t0 = time.perf_counter()
-            reply = await stub.Predict(req, timeout=deadline_sec, wait_for_ready=wait_for_ready)
+            reply = await stub.Predict(req, timeout=deadline_sec, wait_for_ready=wait_for_ready,
+                                       compression=compression)
             elapsed = time.perf_counter() - t0
     else:
-        stub = await _get_grpc_stub(addr, fresh_conn=False)
+        stub = _get_grpc_stub(addr)
         t0 = time.perf_counter()
-        reply = await stub.Predict(req, timeout=deadline_sec, wait_for_ready=wait_for_ready)
+        reply = await stub.Predict(req, timeout=deadline_sec, wait_for_ready=wait_for_ready,
+                                   compression=compression)
         elapsed = time.perf_counter() - t0
 
-    rep_bytes = reply.SerializeToString()
-    outs = [response_tensor_to_numpy(t) for t in reply.outputs]
-    return outs, elapsed, len(req_bytes), len(rep_bytes)
+    # ByteSize() computes the wire size without encoding the message again.
+    outs = response_tensors_to_numpy(reply.outputs)
+    return outs, elapsed, req_sz, reply.ByteSize()
+
+async def _collect_stream(call) -> Tuple[np.ndarray, int]:
+    """Assemble a PredictStream reply into one preallocated array; returns (array, wire bytes)."""
+    out: Optional[np.ndarray] = None
+    buf = memoryview(b"")
+    offset = rep_sz = 0
+    async for chunk in call:
+        rep_sz += chunk.ByteSize()
+        if chunk.HasField("header"):
+            dt = chunk.header.data_type
+            np_dtype = _PB_TO_NP_TBL[dt] if 0 <= dt < len(_PB_TO_NP_TBL) else None
+            if np_dtype is None:
+                raise ValueError(f"Unsupported response dtype enum: {dt}")
+            out = np.empty(tuple(chunk.header.dims), dtype=np.dtype(np_dtype).newbyteorder("<"))
+            buf = memoryview(out.reshape(-1).view(np.uint8))
+            continue
+        # Copy each slice straight into its place in the output; no join of the chunks.
+        buf[offset:offset + len(chunk.data)] = chunk.data
+        offset += len(chunk.data)
+    if out is None or offset != out.nbytes:
+        raise ValueError(f"Incomplete PredictStream reply: got {offset} bytes")
+    return out, rep_sz
+
+async def predict_grpc_stream(addr: str, req: pb.PredictRequest, req_sz: int,
+                              deadline_sec: float, wait_for_ready: bool, fresh_conn: bool,
+                              compression: Optional[grpc.Compression] = None,
+                              ) -> Tuple[List[np.ndarray], float, int, int]:
+    """Same as predict_grpc, but via the server-streaming PredictStream RPC (output[0] only)."""
+    if fresh_conn:
+        import grpc
+        import inference_pb2_grpc as pb_grpc
+        async with grpc.aio.insecure_channel(addr, options=GRPC_OPTS) as channel:
+            stub = pb_grpc.InferenceServiceStub(channel)
+            t0 = time.perf_counter()
+            out, rep_sz = await _collect_stream(
+                stub.PredictStream(req, timeout=deadline_sec, wait_for_ready=wait_for_ready,
+                                   compression=compression)
+            )
+            elapsed = time.perf_counter() - t0
+    else:
+        stub = _get_grpc_stub(addr)
+        t0 = time.perf_counter()
+        out, rep_sz = await _collect_stream(
+            stub.PredictStream(req, timeout=deadline_sec, wait_for_ready=wait_for_ready,
+                               compression=compression)
+        )
+        elapsed = time.perf_counter() - t0
+    return [out], elapsed, req_sz, rep_sz
+
+async def predict_grpc_batch(addr: str, req: pb.PredictRequest, req_sz: int, count: int,
+                             deadline_sec: float, wait_for_ready: bool,
+                             compression: Optional[grpc.Compression] = None,
+                             ) -> Tuple[List[np.ndarray], List[float], int, int]:
+    """Send req `count` times on one PredictBatch stream; returns last outputs and per-reply latencies.
+
+    Each latency is the gap since the previous reply (the first one since the call started),
+    so they sum to the end-to-end time of the whole batch.
+    """
+    stub = _get_grpc_stub(addr)
+    call = stub.PredictBatch(itertools.repeat(req, count), timeout=deadline_sec,
+                             wait_for_ready=wait_for_ready, compression=compression)
+    latencies: List[float] = []
+    reply = pb.PredictReply()
+    t_prev = time.perf_counter()
+    async for reply in call:
+        now = time.perf_counter()
+        latencies.append(now - t_prev)
+        t_prev = now
+    outs = response_tensors_to_numpy(reply.outputs)
+    return outs, latencies, req_sz, reply.ByteSize()
 
 # Compare and print
+# Elements per block for the scanning helpers below; keeps each block and its temporaries in cache.
+_SCAN_BLOCK = 1 << 16
+
+def _min_max(flat: np.ndarray) -> Tuple[float, float]:
+    """Return (min, max) of a non-empty 1-D array, reading each block from memory once."""
+    if flat.size <= _SCAN_BLOCK:
+        return float(flat.min()), float(flat.max())
+    mn = mx = flat[0]
+    for start in range(0, flat.size, _SCAN_BLOCK):
+        block = flat[start:start + _SCAN_BLOCK]
+        mn = np.minimum(mn, block.min())    # NaN propagates, like ndarray.min
+        mx = np.maximum(mx, block.max())
+    return float(mn), float(mx)
+
 def summarize_array(tag: str, arr: np.ndarray, n: int = 8) -> str:
     """Return a short text summary for quick inspection of tensor statistics."""
     flat = arr.ravel()
     sample = flat[:n].tolist()
-    mn = float(flat.min()) if flat.size else 0.0
-    mx = float(flat.max()) if flat.size else 0.0
+    mn, mx = _min_max(flat) if flat.size else (0.0, 0.0)
     return (f"{tag} shape={tuple(arr.shape)} dtype={arr.dtype} "
             f"min={mn:.6g} max={mx:.6g} sample={sample}")
 
 def compare_arrays(a: np.ndarray, b: np.ndarray, rtol: float, atol: float) -> Tuple[bool, float, float]:
-    """Compare arrays using np.allclose and report max absolute and relative error."""
-    ok = bool(np.allclose(a, b, rtol=rtol, atol=atol))
-    diff = np.abs(a - b)
-    max_abs = float(np.max(diff)) if diff.size else 0.0
+    """Compare arrays using np.allclose and report max absolute and relative error.
+
+    Works block by block so every temporary stays in cache and each input is read from
+    memory once, instead of materialising full-size diff/denominator/ratio arrays. The
+    tolerance check is folded into the same per-block diff.
+    """
+    a, b = np.broadcast_arrays(a, b)
+    af, bf = a.ravel(), b.ravel()
+    ok = True
+    max_abs = np.float64(0.0)
+    max_rel = np.float64(0.0)
     with np.errstate(divide="ignore", invalid="ignore"):
-        denom = np.maximum(np.abs(a), np.abs(b))
-        rel = diff / denom
-    if rel.size == 0 or np.isnan(rel).all():
-        max_rel = 0.0
-    else:
-        max_rel_np = cast(np.floating, np.nanmax(rel))
-        max_rel = float(max_rel_np)
-    return ok, max_abs, max_rel
+        for start in range(0, af.size, _SCAN_BLOCK):
+            ab = af[start:start + _SCAN_BLOCK]
+            bb = bf[start:start + _SCAN_BLOCK]
+            diff = np.abs(ab - bb)
+            abs_b = np.abs(bb)
+            block_max = diff.max()
+            # The allclose test reuses diff; once a block fails, later blocks skip it. A block
+            # with a non-finite diff (inf/NaN inputs) defers to np.allclose for its semantics.
+            if ok and not (np.isfinite(block_max) and (diff <= atol + rtol * abs_b).all()):
+                ok = bool(np.allclose(ab, bb, rtol=rtol, atol=atol))
+            max_abs = np.maximum(max_abs, block_max)    # NaN propagates, like np.max
+            rel = diff / np.maximum(np.abs(ab), abs_b)
+            if not np.isnan(rel).all():
+                max_rel = max(max_rel, cast(np.floating, np.nanmax(rel)))
+    return ok, float(max_abs), float(max_rel)
 
 # Input loaders
 def load_input_from_json(path: str, dtype_str: str) -> np.ndarray:
@@ -187,6 +392,7 @@ def load_input_from_json(path: str, dtype_str: str) -> np.ndarray:
 
 def load_input_from_yaml(path: str) -> np.ndarray:
     """Load a NumPy array from a YAML file containing {data, dtype}."""
+    import yaml  # PyYAML
     with open(path, "r", encoding="utf-8") as f:
         obj = yaml.safe_load(f)
     if not isinstance(obj, dict) or "data" not in obj or "dtype" not in obj:
@@ -204,7 +410,7 @@ def parse_args() -> argparse.Namespace:
         description="NEXON client for gRPC (Envoy 8080 by default) with optional REST parity checks."
     )
     p.add_argument("--grpc-addr", default=os.environ.get("NEXON_GRPC_ADDR", "127.0.0.1:8080"),
-                   help="Target address for gRPC (default: Envoy 127.0.0.1:8080)")
+                   help="Target address for gRPC (default: Envoy 127.0.0.1:8080; unix:/path for a Unix socket)")
     p.add_argument("--rest-base", default=os.environ.get("NEXON_REST_BASE", "http://127.0.0.1:8080/inference/infer"),
                    help="Base URL for REST (default: Envoy)")
     p.add_argument("--model-name", required=True, help="Deployed model name (e.g., sigmoid.onnx)")
@@ -221,19 +427,84 @@ def parse_args() -> argparse.Namespace:
     mode.add_argument("--compare-rest", action="store_true", help="Run gRPC then REST and compare outputs.")
     mode.add_argument("--rest-only", action="store_true", help="Run ONLY the REST test.")
 
+    p.add_argument("--concurrent", action="store_true",
+                   help="With --compare-rest, run both protocols at once (faster, but timings interfere)")
     p.add_argument("--rtol", type=float, default=1e-5)
     p.add_argument("--atol", type=float, default=1e-6)
     p.add_argument("--iters", type=int, default=1, help="Repeat requests to show connection reuse effects")
     p.add_argument("--fresh-conn", action="store_true",
                    help="Do NOT reuse connections (new gRPC channel / new HTTP connection each request)")
     p.add_argument("--deadline", type=float, default=60.0, help="gRPC per-call deadline (seconds)")
+    p.add_argument("--stream", action="store_true",
+                   help="Use the server-streaming PredictStream RPC (chunked output, for large tensors)")
+    p.add_argument("--batch", action="store_true",
+                   help="Send all --iters requests on one bidirectional PredictBatch stream")
+    p.add_argument("--compression", choices=list(GRPC_COMPRESSION), default="none",
+                   help="Compress gRPC request messages (pays off on real networks, not on loopback)")
+    p.add_argument("--rest-binary", action="store_true",
+                   help="REST via /infer_bin: raw tensor bytes both ways instead of JSON")
+    p.add_argument("--http2", action="store_true",
+                   help="REST over cleartext HTTP/2 (prior knowledge; Envoy only, needs the h2 package)")
     return p.parse_args()
 
 # Main
+async def run_grpc_iters(args: argparse.Namespace, x: np.ndarray) -> Tuple[List[np.ndarray], float, int, int]:
+    """Run the gRPC side of the plan; returns (last outputs, avg ms, last req size, last reply size)."""
+    import grpc
+    compression = getattr(grpc.Compression, GRPC_COMPRESSION[args.compression])
+    total_ms_grpc = 0.0
+    outs_grpc_last: List[np.ndarray] = []
+    req_sz_last = rep_sz_last = 0
+    # Input is invariant across iterations: encode it once so the loop times only the RPC.
+    req = build_predict_request(args.model_name, x)
+    req_sz = req.ByteSize()
+    if args.batch and args.iters > 1:
+        # One stream for every iteration; per-reply gaps sum to the whole batch time.
+        outs_grpc_last, latencies, req_sz_last, rep_sz_last = await predict_grpc_batch(
+            args.grpc_addr, req, req_sz, args.iters, args.deadline, True,
+            compression,
+        )
+        total_ms_grpc = sum(latencies) * 1000.0
+    else:
+        predict = predict_grpc_stream if args.stream else predict_grpc
+        for i in range(args.iters):
+            outs_grpc, t_grpc, grpc_req_sz, grpc_rep_sz = await predict(
+                args.grpc_addr, req, req_sz, args.deadline, True, args.fresh_conn,
+                compression,
+            )
+            if i == args.iters - 1:
+                outs_grpc_last = outs_grpc
+                req_sz_last, rep_sz_last = grpc_req_sz, grpc_rep_sz
+            total_ms_grpc += t_grpc * 1000.0
+    return outs_grpc_last, total_ms_grpc / args.iters, req_sz_last, rep_sz_last
+
+def run_rest_iters(args: argparse.Namespace, x: np.ndarray) -> Tuple[List[Any], float, int, int]:
+    """Run the REST side of the plan; returns (last outputs, avg ms, last req size, last reply size).
+
+    JSON outputs come back as nested lists; the caller casts them once, to the gRPC dtype.
+    """
+    total_ms_rest = 0.0
+    outs_rest_last: List[Any] = []
+    rest_req_last = rest_rep_last = 0
+    data = as_le_bytes(x) if args.rest_binary else dumps_input(x)
+    for i in range(args.iters):
+        if args.rest_binary:
+            outs_rest, t_rest, rest_req_sz, rest_rep_sz = post_rest_infer_bin(
+                args.rest_base, args.model_name, data, x.shape, x.dtype, args.fresh_conn, args.http2
+            )
+        else:
+            results_json, t_rest, rest_req_sz, rest_rep_sz = post_rest_infer(
+                args.rest_base, args.model_name, data, args.fresh_conn, args.http2
+            )
+            outs_rest = results_json[:1]
+        if i == args.iters - 1:
+            outs_rest_last = outs_rest
+            rest_req_last, rest_rep_last = rest_req_sz, rest_rep_sz
+        total_ms_rest += t_rest * 1000.0
+    return outs_rest_last, total_ms_rest / args.iters, rest_req_last, rest_rep_last
+
 async def main_async(args: argparse.Namespace) -> None:
     """Drive the requested test plan according to parsed CLI arguments."""
-    global _GRPC_CHANNEL, _SESSION
-
     # Choose input
     if args.preset == "sigmoid":
         x = preset_sigmoid()
@@ -244,44 +515,40 @@ async def main_async(args: argparse.Namespace) -> None:
             raise SystemExit("--json requires --dtype")
         x = load_input_from_json(args.json_path, args.dtype)
 
-    # gRPC run
-    outs_grpc_last: List[np.ndarray] = []
-    if not args.rest_only:
-        total_ms_grpc = 0.0
-        req_sz_last = rep_sz_last = 0
-        for i in range(args.iters):
-            outs_grpc, t_grpc, grpc_req_sz, grpc_rep_sz = await predict_grpc(
-                args.grpc_addr, args.model_name, x, args.deadline, True, args.fresh_conn
-            )
-            if i == args.iters - 1:
-                outs_grpc_last = outs_grpc
-                req_sz_last, rep_sz_last = grpc_req_sz, grpc_rep_sz
-            total_ms_grpc += t_grpc * 1000.0
+    if args.rest_only:
+        grpc_res = None
+        rest_res = run_rest_iters(args, x)
+    elif args.compare_rest and args.concurrent:
+        # Opt-in: REST (blocking httpx) runs on a worker thread while gRPC runs on the loop.
+        # Wall time is the longer of the two, but both load the same server and share the
+        # client GIL, so the per-protocol timings are no longer independent.
+        grpc_res, rest_res = await asyncio.gather(
+            run_grpc_iters(args, x), asyncio.to_thread(run_rest_iters, args, x)
+        )
+    elif args.compare_rest:
+        grpc_res = await run_grpc_iters(args, x)
+        rest_res = run_rest_iters(args, x)
+    else:
+        grpc_res, rest_res = await run_grpc_iters(args, x), None
 
-        avg_ms_grpc = total_ms_grpc / args.iters
-        print(f"Inference OK (gRPC @ {args.grpc_addr}). iters={args.iters} fresh={args.fresh_conn}")
+    # gRPC report
+    outs_grpc_last: List[np.ndarray] = []
+    if grpc_res is not None:
+        outs_grpc_last, avg_ms_grpc, req_sz_last, rep_sz_last = grpc_res
+        print(f"Inference OK (gRPC @ {args.grpc_addr}). iters={args.iters} fresh={args.fresh_conn} "
+              f"stream={args.stream} batch={args.batch}")
         for i, arr in enumerate(outs_grpc_last):
             print(" ", summarize_array(f"[grpc output[{i}]]", arr))
         print(f"  gRPC avg time: {avg_ms_grpc:.2f} ms | sizes (last): req={req_sz_last}B rep={rep_sz_last}B")
 
-    # REST run
-    if args.compare_rest or args.rest_only:
-        total_ms_rest = 0.0
-        outs_rest_last: List[np.ndarray] = []
-        rest_req_last = rest_rep_last = 0
-        for i in range(args.iters):
+    # REST report
+    if rest_res is not None:
+        outs_rest_last, avg_ms_rest, rest_req_last, rest_rep_last = rest_res
+        if not args.rest_binary:
             ref_dtype = outs_grpc_last[0].dtype if outs_grpc_last else np.float32
-            results_json, t_rest, rest_req_sz, rest_rep_sz = post_rest_infer(
-                args.rest_base, args.model_name, x, args.fresh_conn
-            )
-            outs_rest = [np.asarray(results_json[0], dtype=ref_dtype)] if results_json else []
-            if i == args.iters - 1:
-                outs_rest_last = outs_rest
-                rest_req_last, rest_rep_last = rest_req_sz, rest_rep_sz
-            total_ms_rest += t_rest * 1000.0
-
-        avg_ms_rest = total_ms_rest / args.iters
-        print(f"\nInference OK (REST @ {args.rest_base}). iters={args.iters} fresh={args.fresh_conn}")
+            outs_rest_last = [np.asarray(o, dtype=ref_dtype) for o in outs_rest_last]
+        print(f"\nInference OK (REST @ {args.rest_base}). iters={args.iters} fresh={args.fresh_conn} "
+              f"binary={args.rest_binary}")
         for i, arr in enumerate(outs_rest_last):
             print(" ", summarize_array(f"[rest output[{i}]]", arr))
         print(f"  REST avg time: {avg_ms_rest:.2f} ms | sizes (last): req={rest_req_last}B rep={rest_rep_last}B")
@@ -292,16 +559,26 @@ async def main_async(args: argparse.Namespace) -> None:
             status = "PASS" if ok else "FAIL"
             print(f"\nPARITY [{status}] rtol={args.rtol} atol={args.atol}")
             print(f"  max_abs_err={max_abs:.3e} | max_rel_err={max_rel:.3e}")
+            if args.concurrent:
+                print("  (gRPC and REST ran concurrently: the avg times above are not independent)")
 
     # Cleanup
-    if _GRPC_CHANNEL:
-        await _GRPC_CHANNEL.close()
-    if _SESSION:
-        _SESSION.close()
+    await close_grpc_channels()
+    if _CLIENT:
+        _CLIENT.close()
 
 def main() -> None:
     """Entry point for CLI execution."""
     args = parse_args()
+    if api_implementation.Type() == "python":
+        # Pure-Python protobuf dominates small-tensor gRPC timings; upb is the default backend.
+        print("WARNING: protobuf pure-Python backend in use; unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION "
+              "for the upb C backend.", file=sys.stderr)
+    try:
+        import uvloop  # optional; not available on Windows
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main_async(args))
 
 if __name__ == "__main__":